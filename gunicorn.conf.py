@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration for serving the TCL Formatter web interface.
+
+Usage:
+    gunicorn -c gunicorn.conf.py web.app:app
+
+Formatting is CPU-bound, so one worker process is started per core; each
+worker also runs a few threads so uploads and responses overlap with
+formatting. The response cache and formatter pool in web.app are per
+process and safe to share between a worker's threads.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('TCL_FORMATTER_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('TCL_FORMATTER_WORKERS', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('TCL_FORMATTER_THREADS', 4))
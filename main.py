@@ -5,9 +5,159 @@ This module initializes the PyQt6 application and launches the main window.
 It includes proper error handling for application startup failures.
 """
 
+import atexit
+import json
+import logging
+import os
 import sys
-from PyQt6.QtWidgets import QApplication, QMessageBox
-from src.ui import TCLFormatterUI
+import threading
+import time
+from contextlib import contextmanager
+
+
+logger = logging.getLogger("tcl_formatter")
+
+# Elapsed milliseconds for each timed startup step, keyed by step name
+_startup_times = {}
+
+
+@contextmanager
+def _profile(name):
+    """
+    Time a startup step and record the elapsed milliseconds.
+    
+    Args:
+        name: Name of the step, used as the key in startup_times.json
+    """
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        _startup_times[name] = (time.perf_counter_ns() - start) / 1_000_000
+
+
+def _enable_profiling():
+    """
+    Run the rest of the process under cProfile.
+    
+    On exit the profile is written to startup.prof, the 30 most expensive
+    calls are printed, and the timed startup steps are written to
+    startup_times.json in the current directory.
+    """
+    import cProfile
+    import pstats
+    
+    profiler = cProfile.Profile()
+    
+    def _dump():
+        profiler.disable()
+        profiler.dump_stats('startup.prof')
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(30)
+        with open('startup_times.json', 'w', encoding='utf-8') as f:
+            json.dump(_startup_times, f, indent=2)
+    
+    atexit.register(_dump)
+    profiler.enable()
+
+
+def _excepthook(exc_type, exc_value, exc_traceback):
+    """
+    Log an unhandled exception and, if possible, show it in a dialog.
+    
+    Installed as sys.excepthook so that startup failures and errors raised
+    inside Qt slots are reported in one place. Qt widgets may only be
+    created on the GUI thread, so exceptions raised on any other thread,
+    including QThread.run, are logged without a dialog.
+    
+    Args:
+        exc_type: Exception class
+        exc_value: Exception instance
+        exc_traceback: Traceback object
+    """
+    if issubclass(exc_type, ImportError):
+        # Handle missing dependencies
+        title = "Import Error"
+        error_msg = (
+            f"Failed to import required modules:\n{str(exc_value)}\n\n"
+            "Please ensure all dependencies are installed:\n"
+            "pip install -r requirements.txt"
+        )
+    else:
+        title = "Application Error"
+        error_msg = (
+            f"An unexpected error occurred:\n{str(exc_value)}\n\n"
+            "See the log output for details."
+        )
+    
+    logger.error(error_msg, exc_info=(exc_type, exc_value, exc_traceback))
+    
+    # Off the GUI thread the log record is the whole report
+    if threading.current_thread() is not threading.main_thread():
+        return
+    
+    # Show a GUI error dialog if PyQt6 is available and the QApplication
+    # was created; otherwise the message above is all we can do
+    try:
+        from PyQt6.QtWidgets import QApplication, QMessageBox
+    except ImportError:
+        return
+    
+    if QApplication.instance():
+        QMessageBox.critical(None, title, error_msg)
+
+
+def _thread_excepthook(args):
+    """
+    Forward unhandled exceptions from Python threads to _excepthook.
+    
+    Args:
+        args: threading.ExceptHookArgs for the failed thread
+    """
+    _excepthook(args.exc_type, args.exc_value, args.exc_traceback)
+
+
+def _qt_message_handler(msg_type, context, message):
+    """
+    Route Qt diagnostic messages through the logging module.
+    
+    Args:
+        msg_type: QtMsgType of the message
+        context: QMessageLogContext (unused)
+        message: The message text
+    """
+    from PyQt6.QtCore import QtMsgType
+    
+    levels = {
+        QtMsgType.QtDebugMsg: logging.DEBUG,
+        QtMsgType.QtInfoMsg: logging.INFO,
+        QtMsgType.QtWarningMsg: logging.WARNING,
+        QtMsgType.QtCriticalMsg: logging.ERROR,
+        QtMsgType.QtFatalMsg: logging.CRITICAL,
+    }
+    logger.log(levels.get(msg_type, logging.WARNING), message)
+
+
+def _create_splash_screen():
+    """
+    Create the startup splash screen.
+    
+    Returns:
+        QSplashScreen: Splash screen with a loading message
+    """
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtGui import QColor, QPixmap
+    from PyQt6.QtWidgets import QSplashScreen
+    
+    pixmap = QPixmap(400, 120)
+    pixmap.fill(QColor("#f5f5f5"))
+    
+    splash = QSplashScreen(pixmap)
+    splash.showMessage(
+        "Loading TCL Formatter & Syntax Debugger...",
+        Qt.AlignmentFlag.AlignCenter,
+        QColor("#333333")
+    )
+    return splash
 
 
 def main():
@@ -16,65 +166,81 @@ def main():
     
     This function:
     1. Creates a QApplication instance
-    2. Creates and shows the main window
-    3. Executes the application event loop
-    4. Handles any startup errors gracefully
+    2. Shows a splash screen while the UI module is imported
+    3. Creates and shows the main window
+    4. Executes the application event loop
+    
+    Errors are reported by the exception hooks installed before startup.
     
     Returns:
         int: Application exit code (0 for success, non-zero for errors)
     """
-    try:
-        # Create QApplication instance
-        # sys.argv is passed to support command-line arguments in the future
-        app = QApplication(sys.argv)
-        
-        # Set application metadata
-        app.setApplicationName("TCL Formatter & Syntax Debugger")
-        app.setOrganizationName("TCL Tools")
-        app.setApplicationVersion("1.0.0")
-        
-        # Create and show main window
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=logging.WARNING,
+        format="%(levelname)s: %(message)s"
+    )
+    sys.excepthook = _excepthook
+    threading.excepthook = _thread_excepthook
+    
+    if '--profile' in sys.argv:
+        sys.argv.remove('--profile')
+        _enable_profiling()
+    
+    # PyQt6 is imported here rather than at module level so that importing
+    # this module (e.g. from tests or packaging scripts) stays cheap
+    from PyQt6.QtCore import QCoreApplication, Qt, QTimer, qInstallMessageHandler
+    from PyQt6.QtGui import QIcon
+    from PyQt6.QtWidgets import QApplication
+    
+    qInstallMessageHandler(_qt_message_handler)
+    
+    # Skip desktop theme plugins and icon theme discovery; the application
+    # uses its own stylesheets, so probing them only slows down startup
+    os.environ.setdefault('QT_QPA_PLATFORMTHEME', '')
+    os.environ.setdefault('QT_STYLE_OVERRIDE', 'fusion')
+    QApplication.setDesktopSettingsAware(False)
+    QIcon.setThemeSearchPaths([])
+    QIcon.setFallbackThemeName('')
+    
+    # Qt attributes must be set before the QApplication is constructed
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_DontCreateNativeWidgetSiblings)
+    
+    # Set application metadata before construction so Qt reads it once
+    # during initialization
+    QCoreApplication.setApplicationName("TCL Formatter & Syntax Debugger")
+    QCoreApplication.setOrganizationName("TCL Tools")
+    QCoreApplication.setApplicationVersion("1.0.0")
+    
+    # The application accepts no Qt command-line flags, so only argv[0] is
+    # passed (Qt uses it for applicationFilePath) and argv scanning is skipped
+    with _profile('QApplication'):
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+    
+    # Show a splash screen before importing the UI module so that
+    # something is on screen while the heavier imports run
+    with _profile('splash'):
+        splash = _create_splash_screen()
+        splash.show()
+        app.processEvents()
+    
+    with _profile('import src.ui'):
+        from src.ui import TCLFormatterUI
+    
+    # Create and show main window
+    with _profile('TCLFormatterUI'):
         main_window = TCLFormatterUI()
         main_window.show()
-        
-        # Execute application event loop
-        # This blocks until the application exits
-        return app.exec()
-        
-    except ImportError as e:
-        # Handle missing dependencies
-        error_msg = (
-            f"Failed to import required modules:\n{str(e)}\n\n"
-            "Please ensure all dependencies are installed:\n"
-            "pip install -r requirements.txt"
-        )
-        print(f"ERROR: {error_msg}", file=sys.stderr)
-        
-        # Try to show a GUI error dialog if PyQt6 is available
-        try:
-            app = QApplication(sys.argv)
-            QMessageBox.critical(None, "Import Error", error_msg)
-        except:
-            pass  # If PyQt6 isn't available, we already printed to stderr
-        
-        return 1
-        
-    except Exception as e:
-        # Handle any other startup errors
-        error_msg = (
-            f"Application startup failed:\n{str(e)}\n\n"
-            "Please check the error message above and try again."
-        )
-        print(f"ERROR: {error_msg}", file=sys.stderr)
-        
-        # Try to show a GUI error dialog
-        try:
-            app = QApplication(sys.argv)
-            QMessageBox.critical(None, "Startup Error", error_msg)
-        except:
-            pass  # If we can't show GUI, we already printed to stderr
-        
-        return 1
+    splash.finish(main_window)
+    
+    # Warm up the formatter once the event loop is idle, keeping it off
+    # the path to an interactive window
+    QTimer.singleShot(0, main_window.warm_caches)
+    
+    # Execute application event loop
+    # This blocks until the application exits
+    return app.exec()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Optional compiled versions of the formatter's per-character scanning loops.
+
+src/formatter.py uses these when the extension has been built and falls back
+to its pure Python implementations otherwise. Build in place with:
+
+    cythonize -i src/_formatter_fast.pyx
+"""
+
+
+def process_line(str line, int line_num, validator):
+    """
+    Track braces and quotes on a single non-comment line.
+
+    Equivalent to the scanning loop of SyntaxValidator._process_line; stack
+    handling and error creation are delegated to the validator.
+
+    Args:
+        line: The line to process
+        line_num: The line number (1-indexed)
+        validator: The SyntaxValidator whose stack and errors are updated
+    """
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t n = len(line)
+    cdef Py_UCS4 c
+    cdef bint in_string = False
+
+    errors = validator.errors
+
+    while i < n:
+        c = line[i]
+
+        # Skip escaped characters
+        if c == u'\\' and i + 1 < n:
+            i += 2
+            continue
+
+        if c == u'"':
+            if in_string:
+                error = validator._pop('"', line_num, i)
+                if error is not None:
+                    errors.append(error)
+                in_string = False
+            else:
+                validator._push('"', line_num, i)
+                in_string = True
+        elif not in_string:
+            if c == u'{':
+                validator._push('{', line_num, i)
+            elif c == u'}':
+                error = validator._pop('}', line_num, i)
+                if error is not None:
+                    errors.append(error)
+
+        i += 1
+
+
+def significant_counts(str line):
+    """
+    Count braces outside strings and unescaped quotes in one scan.
+
+    Args:
+        line: The stripped line to scan
+
+    Returns:
+        Tuple of (open_braces, close_braces, quotes)
+    """
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t n = len(line)
+    cdef Py_UCS4 c
+    cdef bint in_string = False
+    cdef Py_ssize_t open_braces = 0
+    cdef Py_ssize_t close_braces = 0
+    cdef Py_ssize_t quotes = 0
+
+    while i < n:
+        c = line[i]
+
+        if c == u'\\' and i + 1 < n:
+            i += 2
+            continue
+
+        if c == u'"':
+            in_string = not in_string
+            quotes += 1
+        elif not in_string:
+            if c == u'{':
+                open_braces += 1
+            elif c == u'}':
+                close_braces += 1
+
+        i += 1
+
+    return open_braces, close_braces, quotes
+
+
+def indent_step(str line, Py_ssize_t current_level, bint in_string):
+    """
+    Compute the indentation of a stripped line and the state after it.
+
+    Equivalent to IndentationEngine._indent_line outside strict mode.
+
+    Args:
+        line: The stripped, non-empty, non-comment line
+        current_level: The current indentation level
+        in_string: Whether the line starts inside a multi-line string
+
+    Returns:
+        Tuple of (level for this line, level for the next line,
+        string state for the next line)
+    """
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t n = len(line)
+    cdef Py_UCS4 c
+    cdef bint quoted = False
+    cdef Py_ssize_t net = 0
+    cdef Py_ssize_t quotes = 0
+    cdef Py_ssize_t line_level
+
+    while i < n:
+        c = line[i]
+
+        if c == u'\\' and i + 1 < n:
+            i += 2
+            continue
+
+        if c == u'"':
+            quoted = not quoted
+            quotes += 1
+        elif not quoted:
+            if c == u'{':
+                net += 1
+            elif c == u'}':
+                net -= 1
+
+        i += 1
+
+    next_in_string = bool(in_string ^ (quotes & 1))
+
+    if in_string:
+        return current_level, current_level, next_in_string
+
+    if n and line[0] == u'}':
+        line_level = current_level - 1 if current_level > 0 else 0
+        return line_level, line_level + net + 1, next_in_string
+
+    return current_level, current_level + net, next_in_string
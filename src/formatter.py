@@ -4,14 +4,215 @@ TCL Formatter and Syntax Validator
 This module provides the core formatting and validation functionality for TCL files.
 """
 
-import os
-import chardet
+import hashlib
+import re
+import sys
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, Dict, Any
+from os import PathLike
+from typing import List, Optional, Tuple, Dict, Any, Iterable, Iterator, Union
 from pathlib import Path
 
+# Compiled scanning loops (src/_formatter_fast.pyx), used when built
+try:
+    from src import _formatter_fast
+except ImportError:
+    _formatter_fast = None
 
-@dataclass
+
+# Matches the only characters the syntax validator acts on: an escaped
+# character (consumed as a pair), a quote, or a brace
+_SIG_RE = re.compile(r'\\.|["{}]', re.DOTALL)
+
+# Matches an escaped character pair so it can be removed before counting
+_ESC_RE = re.compile(r'\\.', re.DOTALL)
+
+# Matches a line's leading whitespace; its end is the indentation length.
+# \s covers the same characters as str.lstrip() without copying the rest
+# of the line
+_INDENT_RE = re.compile(r'\s*')
+
+# Deletes braces, quotes and backslashes; a line that keeps its length has
+# none of them and can skip the brace and quote scanning entirely
+_SIG_TT = str.maketrans('', '', '{}"\\')
+
+# Finds the first byte outside ASCII in undecoded content
+_NON_ASCII_RE = re.compile(rb'[\x80-\xff]')
+
+# Number of bytes handed to chardet when the encoding has to be detected
+_DETECT_SAMPLE_SIZE = 64 * 1024
+
+# Dataclass options giving instances __slots__ instead of a __dict__, on the
+# Python versions that support it (3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Number of processed contents each TCLFormatter remembers, and the default
+# bound on the characters they may hold in total
+_RESULT_CACHE_SIZE = 32
+_RESULT_CACHE_BYTES = 16 * 1024 * 1024
+
+# Output up to this many characters is encoded and written in one call
+_SINGLE_WRITE_LIMIT = 8 * 1024 * 1024
+
+# Significant character counts of a line that has none
+_NO_COUNTS = (0, 0, 0)
+
+# A list item: plain characters, escaped characters, quoted strings and
+# brace groups that contain no quotes or nested braces
+_LIST_ITEM = r'(?:[^ \t{}"\\]|\\.|"(?:[^"\\]|\\.)*"|\{(?:[^{}"\\]|\\.)*\})+'
+_LIST_ITEM_RE = re.compile(_LIST_ITEM, re.DOTALL)
+
+# A whole list made only of such items, separated by spaces or tabs
+_SIMPLE_LIST_RE = re.compile(r'[ \t]*(?:%s(?:[ \t]+|\Z))*' % _LIST_ITEM, re.DOTALL)
+
+# Common TCL commands that start a new statement
+_COMMON_COMMANDS = frozenset(('set', 'puts', 'return', 'source', 'package', 'namespace'))
+
+
+# A preprocessed line: (text, stripped text, indentation length)
+LineRecord = Tuple[str, str, int]
+
+# A parsed set command: (indent, variable, value)
+SetCommand = Tuple[str, str, str]
+
+# Byte codes of the opening characters stored on the validation stack
+_OPEN_BRACE = ord('{')
+_QUOTE = ord('"')
+
+
+def _preprocess(lines: List[str]) -> List[LineRecord]:
+    """
+    Compute the stripped text and indentation length of each line once.
+    
+    The formatting stages consume these records so that they do not each
+    strip and measure the same lines again.
+    
+    Args:
+        lines: List of code lines
+        
+    Returns:
+        List of (text, stripped, indent) records
+    """
+    return list(_iter_records(lines))
+
+
+def _iter_records(lines: Iterable[str]) -> Iterator[LineRecord]:
+    """
+    Lazily compute the (text, stripped, indent) record of each line.
+    
+    Args:
+        lines: Iterable of code lines
+        
+    Yields:
+        One record per line
+    """
+    for line in lines:
+        lstripped = line.lstrip()
+        yield (line, lstripped.rstrip(), len(line) - len(lstripped))
+
+
+def _significant_counts(line: str) -> Tuple[int, int, int]:
+    """
+    Count the significant characters of a line in a single scan.
+    
+    Braces are only counted outside strings; escaped characters are
+    ignored entirely. The result is shared by every consumer of the line
+    instead of each one scanning it again.
+    
+    Args:
+        line: The stripped line to scan
+        
+    Returns:
+        Tuple of (open_braces, close_braces, quotes)
+    """
+    # Nothing to count on a line without braces, quotes or escapes
+    if len(line.translate(_SIG_TT)) == len(line):
+        return _NO_COUNTS
+    
+    if _formatter_fast is not None:
+        return _formatter_fast.significant_counts(line)
+    
+    # After removing escaped characters, splitting on quotes leaves the
+    # parts outside strings at the even indices
+    segments = _ESC_RE.sub('', line).split('"')
+    outside = segments[::2]
+    open_braces = sum(segment.count('{') for segment in outside)
+    close_braces = sum(segment.count('}') for segment in outside)
+    return open_braces, close_braces, len(segments) - 1
+
+
+def _detect_encoding(sample: bytes) -> Optional[str]:
+    """
+    Detect the encoding of a sample of file content with chardet.
+    
+    chardet is imported here rather than at module level, so it is only
+    loaded once a file that is not UTF-8 turns up.
+    
+    Args:
+        sample: Undecoded content to detect the encoding of
+        
+    Returns:
+        The detected encoding name, or None if it could not be detected
+    """
+    import chardet
+    
+    detected = chardet.detect(sample)
+    return detected.get('encoding') if detected else None
+
+
+def _split_lines(text: str) -> List[str]:
+    """
+    Split decoded file content into lines without newline characters.
+    
+    Matches reading the file in text mode with readlines(): '\r\n' and '\r'
+    count as newlines and a trailing newline does not start an extra line.
+    
+    Args:
+        text: The decoded file content
+        
+    Returns:
+        List of lines from the content
+    """
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = text.split('\n')
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _join_lines(lines: List[str]) -> str:
+    """
+    Join lines into file content, terminating each with a newline.
+    
+    Args:
+        lines: Lines without newline characters
+        
+    Returns:
+        The content to write; empty if there are no lines
+    """
+    if not lines:
+        return ''
+    return '\n'.join(lines) + '\n'
+
+
+def _format_error_log(errors: List['SyntaxError']) -> str:
+    """
+    Render syntax errors as error log text.
+    
+    Each error is written on a separate line with the format
+    "Line X: [error description]".
+    
+    Args:
+        errors: List of syntax errors to log
+        
+    Returns:
+        The error log content
+    """
+    return ''.join(f"Line {error.line_number}: {error.message}\n" for error in errors)
+
+
+@dataclass(**_SLOTS)
 class SyntaxError:
     """Represents a syntax error found during validation."""
     line_number: int
@@ -19,7 +220,7 @@ class SyntaxError:
     error_type: str  # 'brace', 'quote', 'other'
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class StackFrame:
     """Represents an item on the validation stack."""
     char: str  # '{', '}', '"'
@@ -37,9 +238,29 @@ class SyntaxValidator:
     
     def __init__(self):
         """Initialize validator with empty stack."""
-        self.stack: List[StackFrame] = []
+        self._reset_stack()
         self.errors: List[SyntaxError] = []
     
+    def _reset_stack(self):
+        """
+        Empty the stack.
+        
+        The stack is stored as parallel arrays (character byte, line number,
+        position) so a push appends plain values instead of allocating a
+        StackFrame.
+        """
+        self._stack_char = bytearray()
+        self._stack_line: List[int] = []
+        self._stack_pos: List[int] = []
+    
+    @property
+    def stack(self) -> List[StackFrame]:
+        """The open characters on the stack, as StackFrame objects."""
+        return [
+            StackFrame(char=chr(char), line_number=line_num, position=position)
+            for char, line_num, position in zip(self._stack_char, self._stack_line, self._stack_pos)
+        ]
+    
     def validate(self, lines: List[str]) -> List[SyntaxError]:
         """
         Validate braces and quotes using stack-based approach.
@@ -50,13 +271,11 @@ class SyntaxValidator:
         Returns:
             List of SyntaxError objects describing any errors found
         """
-        self.stack = []
+        self._reset_stack()
         self.errors = []
         
         # Handle line continuations by joining lines ending with backslash
-        processed_lines = self._handle_line_continuations(lines)
-        
-        for line_num, line in processed_lines:
+        for line_num, line in self._handle_line_continuations(lines):
             self._process_line(line, line_num)
         
         # Check for unmatched opening characters at end of file
@@ -64,33 +283,48 @@ class SyntaxValidator:
         
         return self.errors
     
-    def _handle_line_continuations(self, lines: List[str]) -> List[Tuple[int, str]]:
+    def _handle_line_continuations(self, lines: List[str]) -> Iterator[Tuple[int, str]]:
         """
         Handle line continuations (lines ending with backslash).
         
         Args:
             lines: List of code lines
             
-        Returns:
-            List of tuples (line_number, processed_line)
+        Yields:
+            Tuples (line_number, processed_line), one per logical line
         """
-        result = []
         i = 0
+        last = len(lines) - 1
         
-        while i < len(lines):
+        while i <= last:
             line = lines[i]
             line_num = i + 1
             
-            # Check if line ends with backslash (continuation)
-            while i < len(lines) - 1 and line.rstrip().endswith('\\'):
-                # Remove the backslash and join with next line
-                line = line.rstrip()[:-1] + lines[i + 1]
+            # Collect the pieces of a continued line and join them once,
+            # rather than re-copying the accumulated text for every piece
+            parts = []
+            while i < last:
+                tail = line.rstrip()
+                if not tail and parts:
+                    # A blank piece: the text before it decides
+                    tail = ''.join(parts).rstrip()
+                    if not tail.endswith('\\'):
+                        break
+                    parts = []
+                elif not tail.endswith('\\'):
+                    break
+                
+                # Remove the backslash and continue with the next line
+                parts.append(tail[:-1])
                 i += 1
+                line = lines[i]
             
-            result.append((line_num, line))
+            if parts:
+                parts.append(line)
+                line = ''.join(parts)
+            
+            yield line_num, line
             i += 1
-        
-        return result
     
     def _process_line(self, line: str, line_num: int):
         """
@@ -105,15 +339,23 @@ class SyntaxValidator:
         if stripped.startswith('#'):
             return
         
+        # Nothing to track on a line without braces, quotes or escapes
+        if len(line.translate(_SIG_TT)) == len(line):
+            return
+        
+        if _formatter_fast is not None:
+            _formatter_fast.process_line(line, line_num, self)
+            return
+        
         in_string = False
-        i = 0
         
-        while i < len(line):
-            char = line[i]
+        # Visit only the significant characters instead of every character
+        for match in _SIG_RE.finditer(line):
+            char = match.group()
+            i = match.start()
             
-            # Handle escaped characters
-            if char == '\\' and i + 1 < len(line):
-                i += 2  # Skip the escaped character
+            # Escaped characters are matched as a pair and skipped
+            if len(char) == 2:
                 continue
             
             # Handle quotes
@@ -137,8 +379,6 @@ class SyntaxValidator:
                     error = self._pop('}', line_num, i)
                     if error:
                         self.errors.append(error)
-            
-            i += 1
     
     def _push(self, char: str, line_num: int, position: int):
         """
@@ -149,8 +389,9 @@ class SyntaxValidator:
             line_num: The line number where the character appears
             position: The position in the line
         """
-        frame = StackFrame(char=char, line_number=line_num, position=position)
-        self.stack.append(frame)
+        self._stack_char.append(ord(char))
+        self._stack_line.append(line_num)
+        self._stack_pos.append(position)
     
     def _pop(self, char: str, line_num: int, position: int) -> Optional[SyntaxError]:
         """
@@ -164,7 +405,7 @@ class SyntaxValidator:
         Returns:
             SyntaxError if there's a mismatch, None otherwise
         """
-        if not self.stack:
+        if not self._stack_char:
             # Unexpected closing character with no matching opening
             error_type = 'brace' if char == '}' else 'quote'
             return SyntaxError(
@@ -173,26 +414,27 @@ class SyntaxValidator:
                 error_type=error_type
             )
         
-        frame = self.stack.pop()
+        top = self._stack_char[-1]
         
-        # Check if the characters match
-        if char == '}' and frame.char != '{':
+        # Check if the characters match; on a mismatch the frame stays put
+        if char == '}' and top != _OPEN_BRACE:
             # Mismatched: expected closing brace but found quote on stack
-            self.stack.append(frame)  # Put it back
             return SyntaxError(
                 line_number=line_num,
-                message=f"Unexpected closing brace, expected closing quote from line {frame.line_number}",
+                message=f"Unexpected closing brace, expected closing quote from line {self._stack_line[-1]}",
                 error_type='brace'
             )
-        elif char == '"' and frame.char != '"':
+        elif char == '"' and top != _QUOTE:
             # Mismatched: expected closing quote but found brace on stack
-            self.stack.append(frame)  # Put it back
             return SyntaxError(
                 line_number=line_num,
-                message=f"Unexpected closing quote, expected closing brace from line {frame.line_number}",
+                message=f"Unexpected closing quote, expected closing brace from line {self._stack_line[-1]}",
                 error_type='quote'
             )
         
+        self._stack_char.pop()
+        self._stack_line.pop()
+        self._stack_pos.pop()
         return None
     
     def _check_remaining_stack(self):
@@ -200,16 +442,16 @@ class SyntaxValidator:
         Check for unmatched opening characters after processing all lines.
         Reports errors for each unmatched opening character.
         """
-        for frame in self.stack:
-            if frame.char == '{':
+        for char, line_num in zip(self._stack_char, self._stack_line):
+            if char == _OPEN_BRACE:
                 error = SyntaxError(
-                    line_number=frame.line_number,
+                    line_number=line_num,
                     message=f"Unmatched opening brace",
                     error_type='brace'
                 )
-            else:  # frame.char == '"'
+            else:  # char == '"'
                 error = SyntaxError(
-                    line_number=frame.line_number,
+                    line_number=line_num,
                     message=f"Unmatched opening quote",
                     error_type='quote'
                 )
@@ -225,7 +467,7 @@ class IndentationEngine:
     """
     
     INDENT_SIZE = 2
-    BLOCK_KEYWORDS = ['if', 'else', 'foreach', 'while', 'switch', 'proc', 'namespace']
+    BLOCK_KEYWORDS = frozenset(('if', 'else', 'foreach', 'while', 'switch', 'proc', 'namespace'))
     
     def __init__(self, strict_mode: bool = False):
         """
@@ -249,150 +491,98 @@ class IndentationEngine:
         if not lines:
             return lines
         
-        result = []
-        current_level = 0
-        in_string = False
-        
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            
-            # Skip empty lines - preserve them as-is
-            if not stripped:
-                result.append(line)
-                continue
-            
-            # Skip comment lines - preserve original indentation
-            if stripped.startswith('#'):
-                result.append(line)
-                continue
-            
-            # Calculate indentation for this line
-            line_level = self._calculate_indent_level(stripped, current_level, in_string)
-            
-            # Apply indentation
-            indented_line = ' ' * (line_level * self.INDENT_SIZE) + stripped
-            result.append(indented_line)
-            
-            # Update current level for next line based on this line's content
-            current_level = self._update_level_after_line(stripped, line_level, in_string)
-            
-            # Track if we're in a string (for multi-line strings)
-            in_string = self._update_string_state(stripped, in_string)
-        
-        return result
+        return [record[0] for record in self.apply_indentation_pre(_preprocess(lines))]
     
-    def _calculate_indent_level(self, line: str, current_level: int, in_string: bool) -> int:
+    def apply_indentation_pre(self, records: List[LineRecord]) -> List[LineRecord]:
         """
-        Calculate indentation level for a line.
+        Apply indentation rules to preprocessed lines.
         
         Args:
-            line: The stripped line to calculate indentation for
-            current_level: The current indentation level
-            in_string: Whether we're currently in a multi-line string
+            records: Line records produced by _preprocess
             
         Returns:
-            The indentation level for this line
+            Line records for the indented lines
         """
-        # If we're in a string, maintain current level
-        if in_string:
-            return current_level
-        
-        # If line starts with closing brace, decrease indentation
-        if line.startswith('}'):
-            return max(0, current_level - 1)
-        
-        # For continuation lines in strict mode
-        if self.strict_mode and self._is_continuation_line(line):
-            # Continuation lines get extra indentation
-            return current_level + 1
-        
-        return current_level
+        return list(self._indent_records(records))
     
-    def _update_level_after_line(self, line: str, line_level: int, in_string: bool) -> int:
+    def _indent_records(self, records: Iterable[LineRecord]) -> Iterator[LineRecord]:
         """
-        Update indentation level after processing a line.
+        Lazily apply indentation rules, one line record at a time.
         
         Args:
-            line: The stripped line that was just processed
-            line_level: The indentation level used for this line
-            in_string: Whether we're currently in a multi-line string
+            records: Iterable of line records
             
-        Returns:
-            The new indentation level for subsequent lines
+        Yields:
+            Line records for the indented lines
         """
-        if in_string:
-            return line_level
-        
-        # Count braces in the line (excluding those in strings)
-        open_braces = 0
-        close_braces = 0
-        in_line_string = False
-        i = 0
+        current_level = 0
+        in_string = False
         
-        while i < len(line):
-            char = line[i]
+        for record in records:
+            stripped = record[1]
             
-            # Handle escaped characters
-            if char == '\\' and i + 1 < len(line):
-                i += 2
+            # Skip empty lines - preserve them as-is
+            if not stripped:
+                yield record
                 continue
             
-            # Handle quotes
-            if char == '"':
-                in_line_string = not in_line_string
-            
-            # Count braces only when not in string
-            if not in_line_string:
-                if char == '{':
-                    open_braces += 1
-                elif char == '}':
-                    close_braces += 1
+            # Skip comment lines - preserve original indentation
+            if stripped.startswith('#'):
+                yield record
+                continue
             
-            i += 1
-        
-        # Calculate net change in brace level
-        net_change = open_braces - close_braces
-        
-        # If line starts with closing brace, we already decreased for this line
-        # So we need to account for that
-        if line.startswith('}'):
-            return line_level + net_change + 1
-        else:
-            return line_level + net_change
+            # Indent this line and carry the state over to the next one
+            prefix, current_level, in_string = self._indent_line(stripped, current_level, in_string)
+            yield (prefix + stripped, stripped, len(prefix))
     
-    def _update_string_state(self, line: str, in_string: bool) -> bool:
+    def _indent_line(self, line: str, current_level: int, in_string: bool) -> Tuple[str, int, bool]:
         """
-        Update whether we're in a multi-line string.
+        Indent a single line and compute the state for the following line.
         
         Args:
-            line: The stripped line to check
-            in_string: Current string state
+            line: The stripped line to indent
+            current_level: The current indentation level
+            in_string: Whether we're currently in a multi-line string
             
         Returns:
-            Updated string state
+            Tuple of (indentation prefix, level for the next line,
+            string state for the next line)
         """
-        # Count unescaped quotes
-        quote_count = 0
-        i = 0
-        
-        while i < len(line):
-            char = line[i]
-            
-            # Handle escaped characters
-            if char == '\\' and i + 1 < len(line):
-                i += 2
-                continue
-            
-            if char == '"':
-                quote_count += 1
+        if _formatter_fast is not None and not self.strict_mode:
+            # The compiled step covers everything except the continuation
+            # line check of strict mode
+            line_level, next_level, next_in_string = _formatter_fast.indent_step(
+                line, current_level, in_string)
+        else:
+            # Scan the line once for braces and quotes
+            open_braces, close_braces, quote_count = _significant_counts(line)
+            
+            if in_string:
+                # If we're in a string, maintain current level
+                line_level = current_level
+                next_level = current_level
+            elif line.startswith('}'):
+                # A closing brace decreases indentation for this line; it is
+                # counted again below, so add it back for the next line
+                line_level = max(0, current_level - 1)
+                next_level = line_level + open_braces - close_braces + 1
+            else:
+                if self.strict_mode and self._is_continuation_line(line):
+                    # Continuation lines get extra indentation
+                    line_level = current_level + 1
+                else:
+                    line_level = current_level
+                next_level = line_level + open_braces - close_braces
             
-            i += 1
+            # Each quote toggles the string state, so only the parity matters
+            next_in_string = bool(in_string ^ (quote_count & 1))
         
-        # Toggle string state for each quote
-        for _ in range(quote_count):
-            in_string = not in_string
+        if 0 <= line_level < _INDENT_CACHE_SIZE:
+            prefix = _INDENT[line_level]
+        else:
+            prefix = ' ' * (line_level * self.INDENT_SIZE)
         
-        return in_string
+        return prefix, next_level, next_in_string
     
     def _is_continuation_line(self, line: str) -> bool:
         """
@@ -420,13 +610,13 @@ class IndentationEngine:
             return False
         
         # Check if line starts with a block keyword
-        first_word = line.split()[0] if line.split() else ''
+        parts = line.split(None, 1)
+        first_word = parts[0] if parts else ''
         if first_word in self.BLOCK_KEYWORDS:
             return False
         
         # Check for common TCL commands that start statements
-        common_commands = ['set', 'puts', 'return', 'source', 'package', 'namespace']
-        if first_word in common_commands:
+        if first_word in _COMMON_COMMANDS:
             return False
         
         # If none of the above, it might be a continuation
@@ -434,6 +624,11 @@ class IndentationEngine:
         return False
 
 
+# Indentation strings for the common nesting levels, built once and shared
+_INDENT_CACHE_SIZE = 128
+_INDENT = tuple(' ' * (level * IndentationEngine.INDENT_SIZE) for level in range(_INDENT_CACHE_SIZE))
+
+
 class ListExpansionEngine:
     """
     Expands long list structures to multiple lines for improved readability.
@@ -461,19 +656,39 @@ class ListExpansionEngine:
         if not lines:
             return lines
         
-        result = []
+        return [record[0] for record in self.expand_long_lists_pre(_preprocess(lines))]
+    
+    def expand_long_lists_pre(self, records: List[LineRecord]) -> List[LineRecord]:
+        """
+        Expand long lists in preprocessed lines.
         
-        for line in lines:
+        Args:
+            records: Line records produced by _preprocess
+            
+        Returns:
+            Line records with expanded lists
+        """
+        return list(self._expand_records(records))
+    
+    def _expand_records(self, records: Iterable[LineRecord]) -> Iterator[LineRecord]:
+        """
+        Lazily expand long lists, one line record at a time.
+        
+        Args:
+            records: Iterable of line records
+            
+        Yields:
+            Line records with expanded lists
+        """
+        for record in records:
+            line, stripped, indent = record
             # Check if this line contains a list that should be expanded
-            if self._should_expand_list(line):
-                expanded = self._expand_list(line)
-                result.extend(expanded)
+            if self._should_expand_list(line, stripped):
+                yield from _iter_records(self._expand_list(line, stripped, indent))
             else:
-                result.append(line)
-        
-        return result
+                yield record
     
-    def _should_expand_list(self, line: str) -> bool:
+    def _should_expand_list(self, line: str, stripped: Optional[str] = None) -> bool:
         """
         Determine if a line contains a list that should be expanded.
         
@@ -483,6 +698,7 @@ class ListExpansionEngine:
         
         Args:
             line: The line to check
+            stripped: The line with surrounding whitespace removed, if known
             
         Returns:
             True if the list should be expanded
@@ -491,7 +707,8 @@ class ListExpansionEngine:
         if len(line) < self.LIST_LENGTH_THRESHOLD:
             return False
         
-        stripped = line.strip()
+        if stripped is None:
+            stripped = line.strip()
         
         # Skip comments
         if stripped.startswith('#'):
@@ -526,19 +743,25 @@ class ListExpansionEngine:
         
         return False
     
-    def _expand_list(self, line: str) -> List[str]:
+    def _expand_list(self, line: str, stripped: Optional[str] = None,
+                     indent_len: Optional[int] = None) -> List[str]:
         """
         Expand a list to multiple lines.
         
         Args:
             line: The line containing the list to expand
+            stripped: The line with surrounding whitespace removed, if known
+            indent_len: Length of the line's indentation, if known
             
         Returns:
             List of expanded lines
         """
         # Get the original indentation
-        indent = line[:len(line) - len(line.lstrip())]
-        stripped = line.strip()
+        if indent_len is None:
+            indent_len = _INDENT_RE.match(line).end()
+        indent = line[:indent_len]
+        if stripped is None:
+            stripped = line.strip()
         
         # Find the list structure
         open_brace_idx = stripped.find('{')
@@ -560,7 +783,7 @@ class ListExpansionEngine:
         result.append(indent + before_list)
         
         # Item lines: each item indented
-        item_indent = indent + ' ' * IndentationEngine.INDENT_SIZE
+        item_indent = indent + _INDENT[1]
         for item in items:
             result.append(item_indent + item)
         
@@ -582,6 +805,11 @@ class ListExpansionEngine:
         Returns:
             List of item strings
         """
+        # Fast path: tokenize in a single regex pass when the content has no
+        # nested braces or quotes inside braces
+        if _SIMPLE_LIST_RE.fullmatch(list_content):
+            return _LIST_ITEM_RE.findall(list_content)
+        
         items = []
         current_item = []
         brace_depth = 0
@@ -665,84 +893,81 @@ class AlignmentEngine:
         if not lines:
             return lines
         
-        # Find all blocks of consecutive set commands
-        set_blocks = self._find_set_blocks(lines)
-        
-        # If no set blocks found, return original lines
-        if not set_blocks:
-            return lines
-        
-        # Create a copy of lines to modify
-        result = lines.copy()
-        
-        # Align each block
-        for block_indices in set_blocks:
-            aligned_block = self._align_block(result, block_indices)
-            # Replace the lines in result with aligned versions
-            for i, line_idx in enumerate(block_indices):
-                result[line_idx] = aligned_block[i]
-        
-        return result
+        return list(self._align_records(_iter_records(lines)))
     
-    def _find_set_blocks(self, lines: List[str]) -> List[List[int]]:
+    def _align_records(self, records: Iterable[LineRecord]) -> Iterator[str]:
         """
-        Identify blocks of consecutive set commands.
+        Lazily align set commands, buffering only the current block.
         
-        A block is a sequence of consecutive lines that are set commands,
-        ignoring empty lines and comments.
+        Lines are held back while a block of set commands may still grow and
+        are released, aligned, as soon as the block ends. A block is a run
+        of set commands at the same indentation; empty lines don't break it,
+        while comments and other commands do.
         
         Args:
-            lines: List of code lines
+            records: Iterable of line records
             
-        Returns:
-            List of blocks, where each block is a list of line indices
+        Yields:
+            Lines with aligned set commands
         """
-        blocks = []
-        current_block = []
+        pending: List[LineRecord] = []
+        block: List[Tuple[int, Optional[SetCommand]]] = []
         current_indent = None
         
-        for i, line in enumerate(lines):
-            stripped = line.strip()
+        for record in records:
+            stripped = record[1]
             
-            # Skip empty lines - they don't break blocks
+            # Empty lines don't break blocks
             if not stripped:
+                if block:
+                    pending.append(record)
+                else:
+                    yield record[0]
                 continue
             
-            # Comments break blocks
-            if stripped.startswith('#'):
-                if len(current_block) > 1:  # Only save blocks with 2+ set commands
-                    blocks.append(current_block)
-                current_block = []
-                current_indent = None
-                continue
-            
-            # Check if this is a set command
             if self._is_set_command(stripped):
-                # Get the indentation level of this line
-                indent = len(line) - len(line.lstrip())
-                
-                # If this is the first set in a potential block, or same indent level
-                if current_indent is None or indent == current_indent:
-                    current_block.append(i)
-                    current_indent = indent
-                else:
+                indent = record[2]
+                if block and indent != current_indent:
                     # Different indent level - start new block
-                    if len(current_block) > 1:
-                        blocks.append(current_block)
-                    current_block = [i]
-                    current_indent = indent
+                    yield from self._flush_block(pending, block)
+                    pending = []
+                    block = []
+                # Parse the command once, as it joins the block
+                block.append((len(pending), self._parse_set_command(*record)))
+                pending.append(record)
+                current_indent = indent
             else:
-                # Not a set command - save current block if it has 2+ commands
-                if len(current_block) > 1:
-                    blocks.append(current_block)
-                current_block = []
-                current_indent = None
+                # Comments and other commands end the current block
+                if block:
+                    yield from self._flush_block(pending, block)
+                    pending = []
+                    block = []
+                yield record[0]
+        
+        if block:
+            yield from self._flush_block(pending, block)
+    
+    def _flush_block(self, pending: List[LineRecord],
+                     block: List[Tuple[int, Optional[SetCommand]]]) -> List[str]:
+        """
+        Release the lines buffered for a block of set commands.
         
-        # Don't forget the last block
-        if len(current_block) > 1:
-            blocks.append(current_block)
+        Args:
+            pending: Line records buffered since the block started
+            block: (index into pending, parsed command) for each set command
+            
+        Returns:
+            The buffered lines, aligned if the block has 2+ set commands
+        """
+        result = [record[0] for record in pending]
         
-        return blocks
+        # Only blocks with 2+ set commands are aligned
+        if len(block) > 1:
+            aligned_block = self._align_parsed([parsed for _, parsed in block if parsed])
+            for i, (line_idx, _) in enumerate(block):
+                result[line_idx] = aligned_block[i]
+        
+        return result
     
     def _is_set_command(self, line: str) -> bool:
         """
@@ -754,68 +979,48 @@ class AlignmentEngine:
         Returns:
             True if the line is a set command
         """
-        # A set command starts with 'set' followed by whitespace
-        if not line.startswith('set '):
-            return False
-        
-        # Make sure it's not part of a larger word (e.g., 'setup')
-        # The 'set ' check above handles this, but let's be explicit
-        parts = line.split(None, 1)  # Split on first whitespace
-        return len(parts) >= 1 and parts[0] == 'set'
+        # A set command starts with 'set' followed by a space; the space also
+        # rules out longer words such as 'setup'
+        return line.startswith('set ')
     
-    def _align_block(self, lines: List[str], block_indices: List[int]) -> List[str]:
+    def _align_parsed(self, parsed_commands: List[SetCommand]) -> List[str]:
         """
-        Align set commands in a single block.
+        Build aligned lines from already parsed set commands.
         
         Args:
-            lines: The full list of lines
-            block_indices: Indices of lines in this block
+            parsed_commands: (indent, variable, value) tuples of the block
             
         Returns:
-            List of aligned lines for this block
+            List of aligned lines for the commands
         """
-        # Extract the set commands from the block
-        set_lines = [lines[i] for i in block_indices]
-        
-        # Parse each set command to extract variable name and value
-        parsed_commands = []
-        for line in set_lines:
-            parsed = self._parse_set_command(line)
-            if parsed:
-                parsed_commands.append(parsed)
-        
         # Find the maximum variable name length
-        max_var_length = max(len(cmd['variable']) for cmd in parsed_commands)
-        
-        # Rebuild each line with aligned values
-        aligned_lines = []
-        for cmd in parsed_commands:
-            indent = cmd['indent']
-            variable = cmd['variable']
-            value = cmd['value']
-            
-            # Calculate padding needed
-            padding = max_var_length - len(variable)
-            
-            # Rebuild the line: indent + "set " + variable + spaces + value
-            aligned_line = indent + 'set ' + variable + ' ' * (padding + 1) + value
-            aligned_lines.append(aligned_line)
+        max_var_length = max([len(variable) for _, variable, _ in parsed_commands])
         
-        return aligned_lines
+        # Rebuild each line: indent + "set " + padded variable + space + value
+        return [
+            f"{indent}set {variable.ljust(max_var_length)} {value}"
+            for indent, variable, value in parsed_commands
+        ]
     
-    def _parse_set_command(self, line: str) -> Optional[dict]:
+    def _parse_set_command(self, line: str, stripped: Optional[str] = None,
+                           indent_len: Optional[int] = None) -> Optional[SetCommand]:
         """
         Parse a set command line into its components.
         
         Args:
             line: The line containing a set command
+            stripped: The line with surrounding whitespace removed, if known
+            indent_len: Length of the line's indentation, if known
             
         Returns:
-            Dictionary with 'indent', 'variable', and 'value' keys, or None if parsing fails
+            Tuple of (indent, variable, value), or None if parsing fails
         """
         # Get the indentation
-        indent = line[:len(line) - len(line.lstrip())]
-        stripped = line.strip()
+        if indent_len is None:
+            indent_len = _INDENT_RE.match(line).end()
+        indent = line[:indent_len]
+        if stripped is None:
+            stripped = line.strip()
         
         # Remove 'set ' from the beginning
         if not stripped.startswith('set '):
@@ -831,14 +1036,7 @@ class AlignmentEngine:
             # No value provided (edge case)
             return None
         
-        variable = parts[0]
-        value = parts[1]
-        
-        return {
-            'indent': indent,
-            'variable': variable,
-            'value': value
-        }
+        return indent, parts[0], parts[1]
     
     def apply_single_space(self, lines: List[str]) -> List[str]:
         """
@@ -853,41 +1051,57 @@ class AlignmentEngine:
         if not lines:
             return lines
         
-        result = []
+        return self.apply_single_space_pre(_preprocess(lines))
+    
+    def apply_single_space_pre(self, records: List[LineRecord]) -> List[str]:
+        """
+        Ensure single-space separation for set commands in preprocessed lines.
         
-        for line in lines:
-            stripped = line.strip()
+        Args:
+            records: Line records produced by _preprocess
+            
+        Returns:
+            List of lines with single-space separation for set commands
+        """
+        return list(self._single_space_records(records))
+    
+    def _single_space_records(self, records: Iterable[LineRecord]) -> Iterator[str]:
+        """
+        Lazily apply single-space separation, one line record at a time.
+        
+        Args:
+            records: Iterable of line records
             
+        Yields:
+            Lines with single-space separation for set commands
+        """
+        for line, stripped, indent_len in records:
             # Check if this is a set command
             if self._is_set_command(stripped):
                 # Parse and rebuild with single space
-                parsed = self._parse_set_command(line)
+                parsed = self._parse_set_command(line, stripped, indent_len)
                 if parsed:
-                    indent = parsed['indent']
-                    variable = parsed['variable']
-                    value = parsed['value']
+                    indent, variable, value = parsed
                     
                     # Rebuild with exactly one space between variable and value
-                    normalized_line = indent + 'set ' + variable + ' ' + value
-                    result.append(normalized_line)
+                    yield indent + 'set ' + variable + ' ' + value
                 else:
                     # Parsing failed, keep original
-                    result.append(line)
+                    yield line
             else:
                 # Not a set command, keep as-is
-                result.append(line)
-        
-        return result
+                yield line
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FormattingResult:
     """Represents the result of a formatting operation."""
     success: bool
-    output_path: Optional[str] = None
-    error_path: Optional[str] = None
+    output_path: Optional[Union[str, PathLike]] = None
+    error_path: Optional[Union[str, PathLike]] = None
     errors: Optional[List[SyntaxError]] = None
     message: str = ""
+    content: Optional[bytes] = None
 
 
 class TCLFormatter:
@@ -900,7 +1114,8 @@ class TCLFormatter:
     """
     
     def __init__(self, align_set: bool = False, expand_lists: bool = False, 
-                 strict_indent: bool = False):
+                 strict_indent: bool = False,
+                 result_cache_bytes: int = _RESULT_CACHE_BYTES):
         """
         Initialize formatter with formatting options.
         
@@ -908,6 +1123,8 @@ class TCLFormatter:
             align_set: If True, align set command values
             expand_lists: If True, expand long lists to multiple lines
             strict_indent: If True, enforce strict indentation for continuation lines
+            result_cache_bytes: Approximate size bound of the result cache, in
+                characters of input and output; 0 disables the cache
         """
         self.align_set = align_set
         self.expand_lists = expand_lists
@@ -918,6 +1135,13 @@ class TCLFormatter:
         self.indentation_engine = IndentationEngine(strict_mode=strict_indent)
         self.alignment_engine = AlignmentEngine()
         self.list_expansion_engine = ListExpansionEngine()
+        
+        # Validation errors and formatted lines by content digest and
+        # options, so that re-formatting unchanged content skips validation
+        # and formatting
+        self._result_cache = OrderedDict()
+        self._result_cache_bytes = 0
+        self._result_cache_limit = result_cache_bytes
     
     def format_file(self, input_path: str) -> FormattingResult:
         """
@@ -936,16 +1160,17 @@ class TCLFormatter:
         Returns:
             FormattingResult object containing success status, paths, and messages
         """
+        # Parse the path once; the helpers below all work from it
+        path = Path(input_path)
+        
         try:
-            # Read the input file with encoding detection
-            lines = self._read_file(input_path)
-            
-            # Validate syntax
-            errors = self.syntax_validator.validate(lines)
+            # Read the input file; validate and format unless the same
+            # content has been processed before
+            errors, formatted_lines = self._process_content(path.read_bytes())
             
             if errors:
                 # Syntax errors found - generate error log
-                error_log_path = self._generate_error_log(input_path, errors)
+                error_log_path = self._generate_error_log(path, errors)
                 return FormattingResult(
                     success=False,
                     error_path=error_log_path,
@@ -953,11 +1178,8 @@ class TCLFormatter:
                     message=f"Syntax validation failed with {len(errors)} error(s). See {error_log_path}"
                 )
             
-            # No syntax errors - proceed with formatting
-            formatted_lines = self._format_lines(lines)
-            
             # Write output file
-            output_path = self._generate_output_path(input_path)
+            output_path = self._generate_output_path(path)
             self._write_file(output_path, formatted_lines)
             
             return FormattingResult(
@@ -982,59 +1204,163 @@ class TCLFormatter:
                 message=f"Unexpected error: {str(e)}"
             )
     
-    def _read_file(self, file_path: str) -> List[str]:
+    def format_bytes(self, data: bytes) -> FormattingResult:
         """
-        Read file with proper encoding detection.
+        Format in-memory TCL content without touching the filesystem.
         
-        This method attempts to detect the file encoding using chardet,
-        falling back to UTF-8 and then system default encoding if needed.
+        Runs the same validation and formatting as format_file, but returns
+        the produced file in the result instead of writing it next to an
+        input file.
         
         Args:
-            file_path: Path to the file to read
+            data: The undecoded file content
             
         Returns:
-            List of lines from the file
+            FormattingResult whose content holds the UTF-8 encoded formatted
+            file, or the error log when syntax validation fails
+        """
+        try:
+            errors, formatted_lines = self._process_content(data)
+        except Exception as e:
+            return FormattingResult(
+                success=False,
+                message=f"Unexpected error: {str(e)}"
+            )
+        
+        if errors:
+            return FormattingResult(
+                success=False,
+                errors=errors,
+                content=_format_error_log(errors).encode('utf-8'),
+                message=f"Syntax validation failed with {len(errors)} error(s)."
+            )
+        
+        return FormattingResult(
+            success=True,
+            content=_join_lines(formatted_lines).encode('utf-8'),
+            message="Successfully formatted"
+        )
+    
+    def _process_content(self, raw_data: bytes) -> Tuple[List[SyntaxError], Optional[List[str]]]:
+        """
+        Validate and format raw file content, reusing earlier results.
+        
+        Results are cached by a digest of the content and the current
+        options, so formatting the same unchanged file again skips decoding,
+        validation and formatting. The cache is bounded by entry count and
+        by result_cache_bytes; callers receive copies of the cached lists.
+        
+        Args:
+            raw_data: The undecoded file content
             
-        Raises:
-            IOError: If file cannot be read
+        Returns:
+            Tuple of (syntax errors, formatted lines); formatted lines are
+            None when there are syntax errors
         """
-        # First, try to detect encoding
-        encoding = 'utf-8'  # Default
+        if self._result_cache_limit <= 0:
+            return self._validate_and_format(raw_data)
+        
+        key = (
+            hashlib.blake2b(raw_data, digest_size=16).digest(),
+            self.align_set, self.expand_lists, self.strict_indent
+        )
+        
+        cached = self._result_cache.get(key)
+        if cached is None:
+            errors, formatted_lines = self._validate_and_format(raw_data)
+            size = len(raw_data) + (sum(map(len, formatted_lines)) if formatted_lines else 0)
+            
+            # Content larger than the whole cache is not worth remembering
+            if size > self._result_cache_limit:
+                return errors, formatted_lines
+            
+            cached = (errors, formatted_lines, size)
+            self._result_cache[key] = cached
+            self._result_cache_bytes += size
+            while (len(self._result_cache) > _RESULT_CACHE_SIZE
+                   or self._result_cache_bytes > self._result_cache_limit):
+                self._result_cache_bytes -= self._result_cache.popitem(last=False)[1][2]
+        else:
+            self._result_cache.move_to_end(key)
         
-        try:
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-                
-            # Detect encoding
-            detected = chardet.detect(raw_data)
-            if detected and detected['encoding']:
-                encoding = detected['encoding']
-        except Exception:
-            # If detection fails, stick with UTF-8
-            pass
+        errors, formatted_lines, _ = cached
+        return list(errors), None if formatted_lines is None else list(formatted_lines)
+    
+    def _validate_and_format(self, raw_data: bytes) -> Tuple[List[SyntaxError], Optional[List[str]]]:
+        """
+        Decode, validate and format raw file content.
         
-        # Read the file with detected encoding
-        try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                lines = f.readlines()
+        Args:
+            raw_data: The undecoded file content
             
-            # Remove newline characters but preserve empty lines
-            lines = [line.rstrip('\r\n') for line in lines]
-            return lines
+        Returns:
+            Tuple of (syntax errors, formatted lines); formatted lines are
+            None when there are syntax errors
+        """
+        lines = _split_lines(self._decode(raw_data))
+        
+        # Validate syntax, then format only valid content
+        errors = self.syntax_validator.validate(lines)
+        formatted_lines = None if errors else self._format_lines(lines)
+        
+        return errors, formatted_lines
+    
+    def format_files(self, input_paths: Iterable[str]) -> Iterator[FormattingResult]:
+        """
+        Format several TCL files with this formatter's engines.
+        
+        The engines are built once and reused for every file. Results are
+        yielded as each file completes, so callers can report progress
+        incrementally.
+        
+        Args:
+            input_paths: Paths to the input TCL files
             
+        Yields:
+            FormattingResult for each file, in input order
+        """
+        for input_path in input_paths:
+            yield self.format_file(input_path)
+    
+    def _decode(self, raw_data: bytes) -> str:
+        """
+        Decode raw file content with proper encoding detection.
+        
+        The content is decoded as UTF-8 first, which covers ASCII and the
+        vast majority of files. Only when that fails is the encoding
+        detected with chardet, falling back to UTF-8 with replacement
+        characters if the detected encoding does not work either.
+        
+        Args:
+            raw_data: The undecoded file content
+            
+        Returns:
+            The decoded content
+        """
+        # Pure ASCII (checked at C speed) needs no further validation
+        if raw_data.isascii():
+            return raw_data.decode('ascii')
+        
+        try:
+            # utf-8-sig also drops a leading byte order mark
+            return raw_data.decode('utf-8-sig')
         except UnicodeDecodeError:
-            # If detected encoding fails, try UTF-8
+            pass
+        
+        # Not UTF-8: detect the encoding from a bounded sample. It is centred
+        # on the first non-ASCII byte so it cannot consist of ASCII only
+        match = _NON_ASCII_RE.search(raw_data)
+        start = max(0, match.start() - _DETECT_SAMPLE_SIZE // 2) if match else 0
+        encoding = _detect_encoding(raw_data[start:start + _DETECT_SAMPLE_SIZE])
+        
+        if encoding:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                lines = [line.rstrip('\r\n') for line in lines]
-                return lines
-            except UnicodeDecodeError:
-                # Last resort: use system default with error handling
-                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                    lines = f.readlines()
-                lines = [line.rstrip('\r\n') for line in lines]
-                return lines
+                return raw_data.decode(encoding)
+            except (UnicodeDecodeError, LookupError):
+                pass
+        
+        # Last resort: UTF-8 with error handling
+        return raw_data.decode('utf-8', errors='replace')
     
     def _format_lines(self, lines: List[str]) -> List[str]:
         """
@@ -1056,46 +1382,54 @@ class TCLFormatter:
         if not lines:
             return lines
         
+        return list(self.format_stream(lines))
+    
+    def format_stream(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        Lazily format lines in a single pass.
+        
+        The formatting stages are chained generators, so each line passes
+        through indentation, list expansion and alignment before the next
+        one is read. No intermediate list is built; alignment holds back
+        only the lines of the current block of set commands.
+        
+        Args:
+            lines: Iterable of code lines (already validated)
+            
+        Yields:
+            Formatted lines
+        """
+        # Strip and measure each line once; the stages pass the records on
+        records = _iter_records(lines)
+        
         # Apply indentation first (always applied)
-        formatted = self.indentation_engine.apply_indentation(lines)
+        records = self.indentation_engine._indent_records(records)
         
         # Apply list expansion if enabled
         if self.expand_lists:
-            formatted = self.list_expansion_engine.expand_long_lists(formatted)
+            records = self.list_expansion_engine._expand_records(records)
         
         # Apply set command alignment if enabled
         if self.align_set:
-            formatted = self.alignment_engine.align_set_commands(formatted)
-        else:
-            # Ensure single-space separation when alignment is disabled
-            formatted = self.alignment_engine.apply_single_space(formatted)
+            return self.alignment_engine._align_records(records)
         
-        return formatted
+        # Ensure single-space separation when alignment is disabled
+        return self.alignment_engine._single_space_records(records)
     
-    def _generate_output_path(self, input_path: str) -> str:
+    def _generate_output_path(self, path: Path) -> Path:
         """
         Generate output file path with "_formatted.tcl" suffix.
         
         Args:
-            input_path: Path to the input file
+            path: Path to the input file
             
         Returns:
             Path for the output file
         """
-        path = Path(input_path)
-        
-        # Get the directory, stem (filename without extension), and extension
-        directory = path.parent
-        stem = path.stem
-        extension = path.suffix
-        
-        # Create new filename with "_formatted" suffix
-        output_filename = f"{stem}_formatted{extension}"
-        output_path = directory / output_filename
-        
-        return str(output_path)
+        # Create new filename with "_formatted" suffix in the same directory
+        return path.with_name(f"{path.stem}_formatted{path.suffix}")
     
-    def _write_file(self, file_path: str, lines: List[str]) -> None:
+    def _write_file(self, file_path: Path, lines: List[str]) -> None:
         """
         Write formatted lines to output file.
         
@@ -1107,21 +1441,25 @@ class TCLFormatter:
             IOError: If file cannot be written
             PermissionError: If write permission is denied
         """
-        # Check if output directory is writable
-        directory = Path(file_path).parent
+        content = _join_lines(lines)
         
-        if not os.access(directory, os.W_OK):
-            raise PermissionError(f"Cannot write to directory: {directory}")
-        
-        # Write the file with UTF-8 encoding
+        # Write the file with UTF-8 encoding; open() itself reports an
+        # unwritable directory, so no separate access check is needed
         try:
-            with open(file_path, 'w', encoding='utf-8', newline='\n') as f:
-                for line in lines:
-                    f.write(line + '\n')
+            if len(content) <= _SINGLE_WRITE_LIMIT:
+                # Encode up front and hand the kernel a single write
+                file_path.write_bytes(content.encode('utf-8'))
+            else:
+                # Encode large output in chunks to bound peak memory
+                with open(file_path, 'wb') as f:
+                    for start in range(0, len(content), _SINGLE_WRITE_LIMIT):
+                        f.write(content[start:start + _SINGLE_WRITE_LIMIT].encode('utf-8'))
+        except PermissionError:
+            raise PermissionError(f"Cannot write to directory: {file_path.parent}")
         except Exception as e:
             raise IOError(f"Failed to write file {file_path}: {str(e)}")
     
-    def _generate_error_log(self, input_path: str, errors: List[SyntaxError]) -> str:
+    def _generate_error_log(self, path: Path, errors: List[SyntaxError]) -> Path:
         """
         Generate error log file with syntax errors.
         
@@ -1130,7 +1468,7 @@ class TCLFormatter:
         with the format "Line X: [error description]".
         
         Args:
-            input_path: Path to the input file
+            path: Path to the input file
             errors: List of syntax errors to log
             
         Returns:
@@ -1139,22 +1477,12 @@ class TCLFormatter:
         Raises:
             IOError: If error log cannot be written
         """
-        path = Path(input_path)
-        directory = path.parent
-        error_log_path = directory / "errors.log"
-        
-        # Format errors
-        error_lines = []
-        for error in errors:
-            error_line = f"Line {error.line_number}: {error.message}"
-            error_lines.append(error_line)
+        error_log_path = path.parent / "errors.log"
         
         # Write error log
         try:
-            with open(error_log_path, 'w', encoding='utf-8') as f:
-                for error_line in error_lines:
-                    f.write(error_line + '\n')
+            error_log_path.write_text(_format_error_log(errors), encoding='utf-8')
         except Exception as e:
             raise IOError(f"Failed to write error log {error_log_path}: {str(e)}")
         
-        return str(error_log_path)
+        return error_log_path
@@ -5,6 +5,10 @@ This module contains the TCLFormatterUI class which provides the graphical
 user interface for the TCL formatter application using PyQt6.
 """
 
+import importlib.util
+import sys
+from typing import Optional
+
 from PyQt6.QtWidgets import (
     QMainWindow,
     QWidget,
@@ -20,7 +24,88 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QFont
-from src.formatter import TCLFormatter, FormattingResult
+
+
+def _lazy_import(name: str):
+    """
+    Import a module lazily.
+    
+    The module body is not executed until one of its attributes is first
+    accessed, which keeps it off the application startup path.
+    
+    Args:
+        name: Fully qualified module name
+        
+    Returns:
+        The (possibly not yet loaded) module object
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# The formatter is only needed once the user formats a file, so it is loaded
+# on first use rather than at window creation
+formatter = _lazy_import('src.formatter')
+
+
+# Stylesheets of the status output, built once for success and error text
+_STATUS_STYLE = """
+    QTextEdit {{
+        background-color: white;
+        border: 1px solid #cccccc;
+        border-radius: 3px;
+        padding: 5px;
+        font-family: 'Courier New', monospace;
+        font-size: 11px;
+        color: {color};
+    }}
+"""
+_STATUS_STYLE_SUCCESS = _STATUS_STYLE.format(color="#2e7d32")  # Green for success
+_STATUS_STYLE_ERROR = _STATUS_STYLE.format(color="#d32f2f")  # Red for errors
+
+
+def _describe_result(result: 'formatter.FormattingResult') -> str:
+    """
+    Build the status message for a formatting result.
+    
+    Args:
+        result: FormattingResult object from the formatter
+        
+    Returns:
+        The message to show in the status display
+    """
+    # Handle the result based on success status
+    if result.success:
+        # Success - display output file path
+        return f"✓ Formatting completed successfully!\n\nOutput file: {result.output_path}"
+    
+    # Check if this is a syntax error or file access error
+    if result.errors:
+        # Syntax errors detected
+        error_count = len(result.errors)
+        parts = [
+            "✗ Syntax validation failed!\n\n",
+            f"Found {error_count} error(s).\n",
+            f"Error log: {result.error_path}\n\n",
+            "Errors:\n",
+        ]
+        # Show first few errors in the status display
+        for error in result.errors[:5]:
+            parts.append(f"  Line {error.line_number}: {error.message}\n")
+        if error_count > 5:
+            parts.append(f"  ... and {error_count - 5} more error(s)\n")
+        return ''.join(parts)
+    
+    # File access or other error
+    return f"✗ Formatting failed!\n\n{result.message}"
 
 
 class FormatterWorker(QThread):
@@ -32,39 +117,45 @@ class FormatterWorker(QThread):
     """
     
     # Signal emitted when formatting is complete
-    finished = pyqtSignal(object)  # Emits FormattingResult
+    finished = pyqtSignal(object, str)  # Emits FormattingResult and status message
     
-    def __init__(self, file_path: str, options: dict):
+    def __init__(self, file_path: str, options: dict, tcl_formatter=None):
         """
         Initialize the worker thread.
         
         Args:
             file_path: Path to the TCL file to format
             options: Dictionary with formatting options (align_set, expand_lists, strict_indent)
+            tcl_formatter: Formatter to reuse; one is created from options if omitted
         """
         super().__init__()
         self.file_path = file_path
         self.options = options
+        self.tcl_formatter = tcl_formatter
     
     def run(self):
         """
         Run the formatting operation in the background thread.
         
         This method is called when the thread starts. It creates a formatter
-        with the specified options, formats the file, and emits the result.
+        with the specified options, formats the file, and emits the result
+        together with its status message, which is built here rather than
+        on the GUI thread.
         """
-        # Create formatter with selected options
-        formatter = TCLFormatter(
-            align_set=self.options.get('align_set', False),
-            expand_lists=self.options.get('expand_lists', False),
-            strict_indent=self.options.get('strict_indent', False)
-        )
+        # Use the provided formatter or create one with selected options
+        tcl_formatter = self.tcl_formatter
+        if tcl_formatter is None:
+            tcl_formatter = formatter.TCLFormatter(
+                align_set=self.options.get('align_set', False),
+                expand_lists=self.options.get('expand_lists', False),
+                strict_indent=self.options.get('strict_indent', False)
+            )
         
         # Format the file
-        result = formatter.format_file(self.file_path)
+        result = tcl_formatter.format_file(self.file_path)
         
         # Emit the result
-        self.finished.emit(result)
+        self.finished.emit(result, _describe_result(result))
 
 
 class TCLFormatterUI(QMainWindow):
@@ -93,6 +184,14 @@ class TCLFormatterUI(QMainWindow):
         # Worker thread reference
         self.worker = None
         
+        # Formatters by (align_set, expand_lists, strict_indent), reused
+        # across runs instead of rebuilding the engines every time
+        self._formatter_cache = {}
+        
+        # Whether the status output is styled for errors (None until the
+        # first status update)
+        self._status_is_error = None
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -367,6 +466,33 @@ class TCLFormatterUI(QMainWindow):
         """
         return self.formatting_options.copy()
     
+    def warm_caches(self):
+        """
+        Build the formatter for the current options ahead of the first run.
+        
+        This also loads the lazily imported formatter module. Intended to be
+        scheduled on the event loop once the window is shown, so the import
+        happens while the UI is idle instead of on startup.
+        """
+        self._get_formatter(self.get_formatting_options())
+    
+    def _get_formatter(self, options: dict) -> 'formatter.TCLFormatter':
+        """
+        Get the cached formatter for a set of options, creating it if needed.
+        
+        Args:
+            options: Dictionary with formatting options (align_set, expand_lists, strict_indent)
+            
+        Returns:
+            TCLFormatter configured with the options
+        """
+        key = (options['align_set'], options['expand_lists'], options['strict_indent'])
+        tcl_formatter = self._formatter_cache.get(key)
+        if tcl_formatter is None:
+            tcl_formatter = formatter.TCLFormatter(*key)
+            self._formatter_cache[key] = tcl_formatter
+        return tcl_formatter
+    
     def format_file(self):
         """
         Invoke formatter with selected options and display results.
@@ -396,10 +522,12 @@ class TCLFormatterUI(QMainWindow):
         # Show processing indicator
         self.update_status("Processing...", is_error=False)
         
-        # Create worker thread with selected file and options
+        # Create worker thread with selected file, options and formatter
+        options = self.get_formatting_options()
         self.worker = FormatterWorker(
             file_path=self.selected_file_path,
-            options=self.get_formatting_options()
+            options=options,
+            tcl_formatter=self._get_formatter(options)
         )
         
         # Connect worker's finished signal to result handler
@@ -408,45 +536,25 @@ class TCLFormatterUI(QMainWindow):
         # Start the worker thread
         self.worker.start()
     
-    def _on_formatting_complete(self, result: FormattingResult):
+    def _on_formatting_complete(self, result: 'formatter.FormattingResult',
+                                message: Optional[str] = None):
         """
         Handle formatting operation completion.
         
         This method is called when the worker thread finishes. It:
-        1. Processes the formatting result (success or error)
-        2. Updates the status display with appropriate message
-        3. Re-enables the format button
-        4. Clears the operation flag
+        1. Updates the status display with the result's message
+        2. Re-enables the format button
+        3. Clears the operation flag
         
         Args:
             result: FormattingResult object from the formatter
+            message: Status message describing the result; built from the
+                result if not given
         """
-        # Handle the result based on success status
-        if result.success:
-            # Success - display output file path
-            message = f"✓ Formatting completed successfully!\n\n"
-            message += f"Output file: {result.output_path}"
-            self.update_status(message, is_error=False)
-        else:
-            # Check if this is a syntax error or file access error
-            if result.errors:
-                # Syntax errors detected
-                error_count = len(result.errors)
-                message = f"✗ Syntax validation failed!\n\n"
-                message += f"Found {error_count} error(s).\n"
-                message += f"Error log: {result.error_path}\n\n"
-                message += "Errors:\n"
-                # Show first few errors in the status display
-                for i, error in enumerate(result.errors[:5]):
-                    message += f"  Line {error.line_number}: {error.message}\n"
-                if error_count > 5:
-                    message += f"  ... and {error_count - 5} more error(s)\n"
-                self.update_status(message, is_error=True)
-            else:
-                # File access or other error
-                message = f"✗ Formatting failed!\n\n"
-                message += result.message
-                self.update_status(message, is_error=True)
+        # Use the message prepared by the worker thread when there is one
+        if message is None:
+            message = _describe_result(result)
+        self.update_status(message, is_error=not result.success)
         
         # Re-enable format button after completion
         self.format_button.setEnabled(True)
@@ -465,22 +573,17 @@ class TCLFormatterUI(QMainWindow):
             message: The status message to display
             is_error: Whether this is an error message (affects styling)
         """
-        # Set text color based on error status
-        if is_error:
-            color = "#d32f2f"  # Red for errors
-        else:
-            color = "#2e7d32"  # Green for success
-        
-        # Update status output with colored message
-        self.status_output.setStyleSheet(f"""
-            QTextEdit {{
-                background-color: white;
-                border: 1px solid #cccccc;
-                border-radius: 3px;
-                padding: 5px;
-                font-family: 'Courier New', monospace;
-                font-size: 11px;
-                color: {color};
-            }}
-        """)
-        self.status_output.setText(message)
+        # Suspend repaints while the style and text change, so the status
+        # output is repainted once instead of once per change
+        self.status_output.setUpdatesEnabled(False)
+        try:
+            # Set text color based on error status; Qt reparses a stylesheet
+            # on every assignment, so only swap it when the status kind changes
+            if is_error is not self._status_is_error:
+                self.status_output.setStyleSheet(_STATUS_STYLE_ERROR if is_error else _STATUS_STYLE_SUCCESS)
+                self._status_is_error = is_error
+            
+            # Update status output with message
+            self.status_output.setText(message)
+        finally:
+            self.status_output.setUpdatesEnabled(True)
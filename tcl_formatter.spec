@@ -0,0 +1,70 @@
+# -*- mode: python ; coding: utf-8 -*-
+"""
+PyInstaller spec for the TCL Formatter & Syntax Debugger desktop application.
+
+Builds a one-directory bundle so modules are loaded from a pre-built archive
+instead of being located and compiled from individual .py files at startup.
+
+Usage:
+    pyinstaller --noconfirm tcl_formatter.spec
+"""
+
+block_cipher = None
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[
+        'PyQt6.QtWidgets',
+        'PyQt6.QtGui',
+        'PyQt6.QtCore',
+        'src.ui',
+        'src.formatter',
+    ],
+    hookspath=[],
+    runtime_hooks=[],
+    # Qt modules the application never uses; excluding them shrinks the
+    # bundle and the amount of data read at launch
+    excludes=[
+        'PyQt6.QtWebEngineCore',
+        'PyQt6.QtWebEngineWidgets',
+        'PyQt6.QtQml',
+        'PyQt6.QtQuick',
+        'PyQt6.QtNetwork',
+        'PyQt6.QtMultimedia',
+        'PyQt6.QtSql',
+        'PyQt6.QtTest',
+        'flask',
+        'werkzeug',
+        'hypothesis',
+        'pytest',
+    ],
+    cipher=block_cipher,
+    noarchive=False,
+)
+
+pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='tcl_formatter',
+    debug=False,
+    strip=False,
+    upx=False,
+    console=False,
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=False,
+    name='tcl_formatter',
+)
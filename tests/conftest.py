@@ -0,0 +1,34 @@
+"""
+Shared pytest fixtures for the test suite.
+"""
+
+import importlib
+import sys
+
+import pytest
+
+
+def pytest_configure(config):
+    """Import the formatter, UI and web modules before any test runs.
+    
+    Loading the formatter, PyQt6 and Flask is then billed to startup (once
+    per worker under pytest-xdist) instead of to whichever test happens to
+    import them first.
+    """
+    import src.formatter  # noqa: F401
+    
+    # PyQt6 and Flask are only needed by the UI and web tests; leave
+    # reporting a missing install to them
+    for module in ('src.ui', 'web.app'):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Create the QApplication once and share it across all UI tests."""
+    QApplication = pytest.importorskip("PyQt6.QtWidgets").QApplication
+    
+    return QApplication.instance() or QApplication(sys.argv)
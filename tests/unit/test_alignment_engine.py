@@ -0,0 +1,53 @@
+"""
+Unit tests for AlignmentEngine.
+
+Tests set command alignment through the list API, including how blocks of
+set commands are grouped.
+"""
+
+import pytest
+from src.formatter import AlignmentEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """Build one AlignmentEngine shared by every test in this module."""
+    return AlignmentEngine()
+
+
+def test_consecutive_set_commands_aligned(engine):
+    """Test that a block of set commands is aligned on the longest name."""
+    lines = ["set a 1", "set long_name 2", "set mid 3"]
+    assert engine.align_set_commands(lines) == [
+        "set a         1",
+        "set long_name 2",
+        "set mid       3",
+    ]
+
+
+def test_empty_lines_do_not_break_blocks(engine):
+    """Test that empty lines inside a block are kept and do not split it."""
+    lines = ["set a 1", "", "set long_name 2"]
+    assert engine.align_set_commands(lines) == ["set a         1", "", "set long_name 2"]
+
+
+def test_comments_and_commands_break_blocks(engine):
+    """Test that comments and other commands end a block."""
+    lines = ["set a 1", "# comment", "set long_name 2", "puts x", "set b 3"]
+    assert engine.align_set_commands(lines) == lines
+
+
+def test_indent_change_starts_new_block(engine):
+    """Test that set commands at another indentation form their own block."""
+    lines = ["set a 1", "set bb 2", "  set long_name 3", "  set c 4"]
+    assert engine.align_set_commands(lines) == [
+        "set a  1",
+        "set bb 2",
+        "  set long_name 3",
+        "  set c         4",
+    ]
+
+
+def test_empty_input(engine):
+    """Test that empty input is returned unchanged."""
+    assert engine.align_set_commands([]) == []
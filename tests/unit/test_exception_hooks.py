@@ -0,0 +1,56 @@
+"""
+Unit tests for the application's unhandled exception hooks.
+
+Tests that errors are reported with a dialog only on the GUI thread.
+"""
+
+import logging
+import threading
+from unittest.mock import patch
+
+import pytest
+
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+import main
+
+
+def _raise_in_thread():
+    """Run a thread whose target raises, reporting it through the app hook."""
+    def fail():
+        raise ValueError("worker failure")
+    
+    with patch.object(threading, 'excepthook', main._thread_excepthook):
+        thread = threading.Thread(target=fail)
+        thread.start()
+        thread.join()
+
+
+def test_thread_exception_builds_no_dialog(qapp):
+    """Test that an exception on a worker thread opens no dialog."""
+    with patch.object(QtWidgets.QMessageBox, 'critical') as critical:
+        _raise_in_thread()
+    
+    critical.assert_not_called()
+
+
+def test_thread_exception_is_logged(qapp, caplog):
+    """Test that an exception on a worker thread is logged with its traceback."""
+    with patch.object(QtWidgets.QMessageBox, 'critical'), \
+            caplog.at_level(logging.ERROR, logger="tcl_formatter"):
+        _raise_in_thread()
+    
+    (record,) = caplog.records
+    assert "worker failure" in record.getMessage()
+    assert record.exc_info[0] is ValueError
+
+
+def test_main_thread_exception_shows_dialog(qapp):
+    """Test that an exception on the GUI thread is shown in a dialog."""
+    error = ValueError("startup failure")
+    
+    with patch.object(QtWidgets.QMessageBox, 'critical') as critical:
+        main._excepthook(ValueError, error, None)
+    
+    critical.assert_called_once()
+    assert "startup failure" in critical.call_args.args[2]
@@ -5,29 +5,62 @@ Tests Requirements: 4.1, 4.2, 4.3, 4.4
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock
-from PyQt6.QtWidgets import QApplication
-import sys
+from types import SimpleNamespace
 
+import pytest
+
+# Skip this module rather than failing collection where PyQt6 is missing
+pytest.importorskip("PyQt6.QtWidgets")
+
+import src.ui as _ui_module
 from src.ui import TCLFormatterUI
 from src.formatter import FormattingResult, SyntaxError
 
 
+# Colour codes of the success and error status stylesheets
+_GREEN = "#2e7d32"
+_RED = "#d32f2f"
+
+
+@pytest.mark.usefixtures("qapp")
 class TestStatusDisplay(unittest.TestCase):
     """Test status display and result reporting."""
     
     @classmethod
     def setUpClass(cls):
-        """Create QApplication instance for all tests."""
-        # Create QApplication if it doesn't exist
-        if not QApplication.instance():
-            cls.app = QApplication(sys.argv)
-        else:
-            cls.app = QApplication.instance()
+        """Create one main window for all tests (the QApplication is shared)."""
+        cls.ui = TCLFormatterUI()
+        
+        # Results are only read by the UI, so one instance serves every test
+        cls.syntax_error_result = FormattingResult(
+            success=False,
+            error_path="/path/to/errors.log",
+            errors=[
+                SyntaxError(line_number=5, message="Unmatched opening brace", error_type="brace"),
+                SyntaxError(line_number=10, message="Unmatched quote", error_type="quote")
+            ],
+            message="Syntax validation failed"
+        )
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Release the shared main window."""
+        cls.ui.deleteLater()
+        cls.ui = None
     
     def setUp(self):
-        """Set up test fixtures."""
-        self.ui = TCLFormatterUI()
+        """Reset the window state left behind by the previous test."""
+        self.ui.status_output.clear()
+        self.ui._status_is_error = None
+        self.ui.selected_file_path = None
+        self.ui.format_button.setEnabled(False)
+        self.ui.operation_in_progress = False
+        self.ui.worker = None
+    
+    def _assert_all_in(self, text, *needles):
+        """Assert that every needle occurs in text, reporting all missing ones."""
+        missing = [needle for needle in needles if needle not in text]
+        self.assertFalse(missing, f"Missing from status text: {missing}")
     
     def test_update_status_with_success_message(self):
         """Test that update_status displays success messages with green color."""
@@ -36,12 +69,14 @@ class TestStatusDisplay(unittest.TestCase):
         
         self.ui.update_status(message, is_error=False)
         
+        status_text = self.ui.status_output.toPlainText()
+        stylesheet = self.ui.status_output.styleSheet()
+        
         # Verify the message is displayed
-        self.assertEqual(self.ui.status_output.toPlainText(), message)
+        self.assertEqual(status_text, message)
         
         # Verify green color is applied (check stylesheet contains green color)
-        stylesheet = self.ui.status_output.styleSheet()
-        self.assertIn("#2e7d32", stylesheet)  # Green color code
+        self.assertIn(_GREEN, stylesheet)
     
     def test_update_status_with_error_message(self):
         """Test that update_status displays error messages with red color."""
@@ -50,27 +85,34 @@ class TestStatusDisplay(unittest.TestCase):
         
         self.ui.update_status(message, is_error=True)
         
+        status_text = self.ui.status_output.toPlainText()
+        stylesheet = self.ui.status_output.styleSheet()
+        
         # Verify the message is displayed
-        self.assertEqual(self.ui.status_output.toPlainText(), message)
+        self.assertEqual(status_text, message)
         
         # Verify red color is applied (check stylesheet contains red color)
-        stylesheet = self.ui.status_output.styleSheet()
-        self.assertIn("#d32f2f", stylesheet)  # Red color code
+        self.assertIn(_RED, stylesheet)
     
     def test_processing_message_displayed(self):
         """Test that 'Processing...' is displayed when operation starts."""
         # Requirement 4.1: Display "Processing..." when operation starts
         self.ui.selected_file_path = "test.tcl"
         
-        # Mock the worker thread to prevent actual formatting
-        with patch('src.ui.FormatterWorker') as mock_worker:
-            mock_instance = Mock()
-            mock_worker.return_value = mock_instance
-            
+        # Swap in a stub worker thread to prevent actual formatting
+        worker = SimpleNamespace(
+            start=lambda: None,
+            finished=SimpleNamespace(connect=lambda *_: None)
+        )
+        original_worker = _ui_module.FormatterWorker
+        _ui_module.FormatterWorker = lambda *args, **kwargs: worker
+        try:
             self.ui.format_file()
-            
-            # Verify "Processing..." message is displayed
-            self.assertEqual(self.ui.status_output.toPlainText(), "Processing...")
+        finally:
+            _ui_module.FormatterWorker = original_worker
+        
+        # Verify "Processing..." message is displayed
+        self.assertEqual(self.ui.status_output.toPlainText(), "Processing...")
     
     def test_success_result_display(self):
         """Test that successful formatting displays output file path."""
@@ -85,8 +127,11 @@ class TestStatusDisplay(unittest.TestCase):
         
         # Verify success message contains output path
         status_text = self.ui.status_output.toPlainText()
-        self.assertIn("✓ Formatting completed successfully!", status_text)
-        self.assertIn("/path/to/file_formatted.tcl", status_text)
+        self._assert_all_in(
+            status_text,
+            "✓ Formatting completed successfully!",
+            "/path/to/file_formatted.tcl"
+        )
         
         # Verify format button is re-enabled
         self.assertTrue(self.ui.format_button.isEnabled())
@@ -94,27 +139,18 @@ class TestStatusDisplay(unittest.TestCase):
     def test_syntax_error_result_display(self):
         """Test that syntax errors display error log path and count."""
         # Requirement 4.3: Display error message with error log path and count
-        errors = [
-            SyntaxError(line_number=5, message="Unmatched opening brace", error_type="brace"),
-            SyntaxError(line_number=10, message="Unmatched quote", error_type="quote")
-        ]
-        
-        result = FormattingResult(
-            success=False,
-            error_path="/path/to/errors.log",
-            errors=errors,
-            message="Syntax validation failed"
-        )
-        
-        self.ui._on_formatting_complete(result)
+        self.ui._on_formatting_complete(self.syntax_error_result)
         
         # Verify error message contains error count and log path
         status_text = self.ui.status_output.toPlainText()
-        self.assertIn("✗ Syntax validation failed!", status_text)
-        self.assertIn("Found 2 error(s)", status_text)
-        self.assertIn("/path/to/errors.log", status_text)
-        self.assertIn("Line 5: Unmatched opening brace", status_text)
-        self.assertIn("Line 10: Unmatched quote", status_text)
+        self._assert_all_in(
+            status_text,
+            "✗ Syntax validation failed!",
+            "Found 2 error(s)",
+            "/path/to/errors.log",
+            "Line 5: Unmatched opening brace",
+            "Line 10: Unmatched quote"
+        )
         
         # Verify format button is re-enabled
         self.assertTrue(self.ui.format_button.isEnabled())
@@ -131,8 +167,7 @@ class TestStatusDisplay(unittest.TestCase):
         
         # Verify error message is displayed
         status_text = self.ui.status_output.toPlainText()
-        self.assertIn("✗ Formatting failed!", status_text)
-        self.assertIn("Permission denied", status_text)
+        self._assert_all_in(status_text, "✗ Formatting failed!", "Permission denied")
         
         # Verify format button is re-enabled
         self.assertTrue(self.ui.format_button.isEnabled())
@@ -151,7 +186,11 @@ class TestStatusDisplay(unittest.TestCase):
         
         # Verify operation flag is cleared
         self.assertFalse(self.ui.operation_in_progress)
-
-
-if __name__ == '__main__':
-    unittest.main()
+    
+    def test_warm_caches_builds_formatter(self):
+        """Test that warming up prepares the formatter for the current options."""
+        self.ui._formatter_cache.clear()
+        
+        self.ui.warm_caches()
+        
+        self.assertEqual(list(self.ui._formatter_cache), [(False, False, False)])
@@ -2,144 +2,124 @@
 Unit tests for SyntaxValidator class.
 """
 
-import unittest
-import sys
-import os
-
-# Add src directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-
-from formatter import SyntaxValidator, SyntaxError
-
-
-class TestSyntaxValidator(unittest.TestCase):
-    """Test cases for SyntaxValidator."""
-    
-    def setUp(self):
-        """Set up test fixtures."""
-        self.validator = SyntaxValidator()
-    
-    def test_valid_code_no_errors(self):
-        """Test that valid code produces no errors."""
-        lines = [
-            'set x 10',
-            'if {$x > 5} {',
-            '    puts "x is greater than 5"',
-            '}'
-        ]
-        errors = self.validator.validate(lines)
-        self.assertEqual(len(errors), 0)
-    
-    def test_unmatched_opening_brace(self):
-        """Test detection of unmatched opening brace."""
-        lines = [
-            'if {$x > 5} {',
-            '    puts "hello"',
-            # Missing closing brace
-        ]
-        errors = self.validator.validate(lines)
-        self.assertEqual(len(errors), 1)
-        self.assertEqual(errors[0].error_type, 'brace')
-        self.assertEqual(errors[0].line_number, 1)
-        self.assertIn('Unmatched opening brace', errors[0].message)
-    
-    def test_unmatched_closing_brace(self):
-        """Test detection of unexpected closing brace."""
-        lines = [
-            'set x 10',
-            '}',  # Unexpected closing brace
-        ]
-        errors = self.validator.validate(lines)
-        self.assertEqual(len(errors), 1)
-        self.assertEqual(errors[0].error_type, 'brace')
-        self.assertEqual(errors[0].line_number, 2)
-        self.assertIn('Unexpected closing', errors[0].message)
-    
-    def test_unmatched_opening_quote(self):
-        """Test detection of unmatched opening quote."""
-        lines = [
-            'set x "hello',
-            # Missing closing quote
-        ]
-        errors = self.validator.validate(lines)
-        self.assertEqual(len(errors), 1)
-        self.assertEqual(errors[0].error_type, 'quote')
-        self.assertEqual(errors[0].line_number, 1)
-        self.assertIn('Unmatched opening quote', errors[0].message)
-    
-    def test_unmatched_closing_quote(self):
-        """Test detection of unexpected closing quote."""
-        lines = [
-            'set x 10',
-            'puts "',  # Unexpected closing quote on next line would be caught
-        ]
-        errors = self.validator.validate(lines)
-        self.assertEqual(len(errors), 1)
-        self.assertEqual(errors[0].error_type, 'quote')
-    
-    def test_nested_braces(self):
-        """Test validation of nested braces."""
-        lines = [
-            'if {$x > 5} {',
-            '    if {$y > 10} {',
-            '        puts "nested"',
-            '    }',
-            '}'
-        ]
-        errors = self.validator.validate(lines)
-        self.assertEqual(len(errors), 0)
-    
-    def test_escaped_characters(self):
-        """Test that escaped characters are handled correctly."""
-        lines = [
-            'set x "hello \\" world"',
-            'set y "path\\\\to\\\\file"'
-        ]
-        errors = self.validator.validate(lines)
-        self.assertEqual(len(errors), 0)
-    
-    def test_braces_in_strings(self):
-        """Test that braces inside strings don't affect validation."""
-        lines = [
-            'set x "this has { and } in it"',
-            'puts "another {brace}"'
-        ]
-        errors = self.validator.validate(lines)
-        self.assertEqual(len(errors), 0)
-    
-    def test_comments_ignored(self):
-        """Test that comment lines are ignored."""
-        lines = [
-            '# This is a comment with { unmatched brace',
-            'set x 10',
-            '# Another comment with " unmatched quote'
-        ]
-        errors = self.validator.validate(lines)
-        self.assertEqual(len(errors), 0)
-    
-    def test_multiple_errors(self):
-        """Test detection of multiple errors."""
-        lines = [
-            'if {$x > 5} {',
-            'set y "unclosed string',
-            # Missing closing brace and quote
-        ]
-        errors = self.validator.validate(lines)
-        self.assertEqual(len(errors), 2)
-        error_types = {e.error_type for e in errors}
-        self.assertIn('brace', error_types)
-        self.assertIn('quote', error_types)
-    
-    def test_line_continuation(self):
-        """Test that line continuations are handled correctly."""
-        lines = [
-            'set long_string "This is a long string that \\',
-            'continues on the next line and \\',
-            'ends here"'
-        ]
-        errors = self.validator.validate(lines)
-        self.assertEqual(len(errors), 0)
-
-
-if __name__ == '__main__':
-    unittest.main()
+import pytest
+
+from src.formatter import SyntaxValidator, SyntaxError
+
+
+@pytest.fixture(scope="module")
+def validator():
+    """Build one SyntaxValidator shared by every test in this module."""
+    return SyntaxValidator()
+
+
+# Test inputs, shared as tuples since validation and indentation only read them
+_VALID_CODE_NO_ERRORS_LINES = (
+    'set x 10',
+    'if {$x > 5} {',
+    '    puts "x is greater than 5"',
+    '}'
+)
+_UNMATCHED_OPENING_BRACE_LINES = (
+    'if {$x > 5} {',
+    '    puts "hello"',
+    # Missing closing brace
+)
+_UNMATCHED_CLOSING_BRACE_LINES = (
+    'set x 10',
+    '}',  # Unexpected closing brace
+)
+_UNMATCHED_OPENING_QUOTE_LINES = (
+    'set x "hello',
+    # Missing closing quote
+)
+_UNMATCHED_CLOSING_QUOTE_LINES = (
+    'set x 10',
+    'puts "',  # Unexpected closing quote on next line would be caught
+)
+_NESTED_BRACES_LINES = (
+    'if {$x > 5} {',
+    '    if {$y > 10} {',
+    '        puts "nested"',
+    '    }',
+    '}'
+)
+_ESCAPED_CHARACTERS_LINES = (
+    'set x "hello \\" world"',
+    'set y "path\\\\to\\\\file"'
+)
+_BRACES_IN_STRINGS_LINES = (
+    'set x "this has { and } in it"',
+    'puts "another {brace}"'
+)
+_COMMENTS_IGNORED_LINES = (
+    '# This is a comment with { unmatched brace',
+    'set x 10',
+    '# Another comment with " unmatched quote'
+)
+_MULTIPLE_ERRORS_LINES = (
+    'if {$x > 5} {',
+    'set y "unclosed string',
+    # Missing closing brace and quote
+)
+_LINE_CONTINUATION_LINES = (
+    'set long_string "This is a long string that \\',
+    'continues on the next line and \\',
+    'ends here"'
+)
+
+
+def test_unmatched_opening_brace(validator):
+    """Test detection of unmatched opening brace."""
+    errors = validator.validate(_UNMATCHED_OPENING_BRACE_LINES)
+    assert len(errors) == 1
+    assert errors[0].error_type == 'brace'
+    assert errors[0].line_number == 1
+    assert 'Unmatched opening brace' in errors[0].message
+
+
+def test_unmatched_closing_brace(validator):
+    """Test detection of unexpected closing brace."""
+    errors = validator.validate(_UNMATCHED_CLOSING_BRACE_LINES)
+    assert len(errors) == 1
+    assert errors[0].error_type == 'brace'
+    assert errors[0].line_number == 2
+    assert 'Unexpected closing' in errors[0].message
+
+
+def test_unmatched_opening_quote(validator):
+    """Test detection of unmatched opening quote."""
+    errors = validator.validate(_UNMATCHED_OPENING_QUOTE_LINES)
+    assert len(errors) == 1
+    assert errors[0].error_type == 'quote'
+    assert errors[0].line_number == 1
+    assert 'Unmatched opening quote' in errors[0].message
+
+
+def test_unmatched_closing_quote(validator):
+    """Test detection of unexpected closing quote."""
+    errors = validator.validate(_UNMATCHED_CLOSING_QUOTE_LINES)
+    assert len(errors) == 1
+    assert errors[0].error_type == 'quote'
+
+
+def test_multiple_errors(validator):
+    """Test detection of multiple errors."""
+    errors = validator.validate(_MULTIPLE_ERRORS_LINES)
+    assert len(errors) == 2
+    error_types = {e.error_type for e in errors}
+    assert 'brace' in error_types
+    assert 'quote' in error_types
+
+
+@pytest.mark.parametrize('lines', [
+    _VALID_CODE_NO_ERRORS_LINES,
+    _NESTED_BRACES_LINES,
+    _ESCAPED_CHARACTERS_LINES,
+    _BRACES_IN_STRINGS_LINES,
+    _COMMENTS_IGNORED_LINES,
+    _LINE_CONTINUATION_LINES
+], ids=['simple', 'nested', 'escaped', 'braces_in_str', 'comments', 'continuation'])
+def test_valid_inputs(validator, lines):
+    """Test that valid code, including the edge cases, produces no errors."""
+    assert validator.validate(lines) == []
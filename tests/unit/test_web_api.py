@@ -11,19 +11,16 @@ Tests the /format endpoint with various scenarios including:
 import pytest
 import os
 import tempfile
-from pathlib import Path
+import zipfile
 from io import BytesIO
-import sys
-
-# Add parent directory to path to import web app
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from unittest.mock import patch
 
 from web.app import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client():
-    """Create a test client for the Flask app."""
+    """Create one test client for the Flask app, shared by the module."""
     app.config['TESTING'] = True
     with app.test_client() as client:
         yield client
@@ -120,6 +117,84 @@ set variable_name 20"""
     assert response.headers['Content-Type'] == 'application/octet-stream'
 
 
+def test_format_endpoint_reuses_cached_response(client):
+    """Test that resubmitting the same content and options skips formatting."""
+    tcl_content = b"""proc cached {} {
+puts "cached"
+}"""
+    
+    def post():
+        data = {'file': (BytesIO(tcl_content), 'cached.tcl')}
+        return client.post('/format', data=data, content_type='multipart/form-data')
+    
+    first = post()
+    
+    with patch('web.app._format_content', side_effect=AssertionError('not cached')):
+        second = post()
+    
+    assert second.status_code == 200
+    assert second.data == first.data
+    assert 'cached_formatted.tcl' in second.headers.get('Content-Disposition', '')
+
+
+def test_format_endpoint_etag_keeps_attachment(client):
+    """Test that /format tags its output but still sends it uncached."""
+    def post(headers=None):
+        data = {'file': (BytesIO(b"set x 1"), 'etag.tcl')}
+        return client.post('/format', data=data, headers=headers,
+                           content_type='multipart/form-data')
+    
+    first = post()
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'no-cache'
+    
+    response = post({'If-None-Match': etag})
+    
+    assert response.status_code == 200
+    assert response.data == first.data
+    assert response.headers['ETag'] == etag
+    assert response.headers['Cache-Control'] == 'no-cache'
+    assert 'etag_formatted.tcl' in response.headers['Content-Disposition']
+
+
+def test_format_batch_endpoint(client):
+    """Test formatting several files into one zip archive."""
+    data = {
+        'files': [
+            (BytesIO(b"proc a {} {\nputs a\n}"), 'a.tcl'),
+            (BytesIO(b"if {1} {\n"), 'b.tcl'),
+            (BytesIO(b"set x 1"), 'a.tcl')
+        ],
+        'align_set': 'true'
+    }
+    
+    response = client.post('/format_batch', data=data, content_type='multipart/form-data')
+    
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'application/zip'
+    assert 'formatted.zip' in response.headers.get('Content-Disposition', '')
+    
+    with zipfile.ZipFile(BytesIO(response.data)) as archive:
+        assert archive.namelist() == ['a_formatted.tcl', 'b_errors.log', '2_a_formatted.tcl']
+        assert archive.read('a_formatted.tcl') == b"proc a {} {\n  puts a\n}\n"
+        assert archive.read('b_errors.log').startswith(b"Line 1:")
+
+
+def test_format_batch_endpoint_invalid_extension(client):
+    """Test that a batch with any non-TCL file is rejected."""
+    data = {
+        'files': [
+            (BytesIO(b"set x 1"), 'a.tcl'),
+            (BytesIO(b"some content"), 'b.txt')
+        ]
+    }
+    
+    response = client.post('/format_batch', data=data, content_type='multipart/form-data')
+    
+    assert response.status_code == 400
+    assert response.json['error'] == 'Invalid file extension. Only .tcl files are allowed'
+
+
 def test_index_route(client):
     """Test that the index route serves HTML."""
     response = client.get('/')
@@ -129,6 +204,16 @@ def test_index_route(client):
     # Note: This will fail until we create the HTML template
 
 
+def test_index_route_not_modified(client):
+    """Test that the index page honors its ETag."""
+    etag = client.get('/').headers['ETag']
+    
+    response = client.get('/', headers={'If-None-Match': etag})
+    
+    assert response.status_code == 304
+    assert response.data == b''
+
+
 def test_error_handler_413(client):
     """Test that file size limit error handler works."""
     # Create a file larger than 10MB
@@ -4,10 +4,14 @@ Flask backend for TCL Formatter web interface.
 This module provides a REST API for formatting TCL files through a web interface.
 """
 
-from flask import Flask, render_template, request, send_file, jsonify
-import os
-import tempfile
+from flask import Flask, render_template, request, jsonify
+import hashlib
+import threading
+import zipfile
+from collections import OrderedDict
+from functools import lru_cache
 from io import BytesIO
+from werkzeug.http import dump_options_header
 from werkzeug.utils import secure_filename
 from src.formatter import TCLFormatter, FormattingResult
 
@@ -16,17 +20,45 @@ app = Flask(__name__)
 # Configuration
 app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024  # 10MB max file size
 ALLOWED_EXTENSIONS = {'tcl'}
+_ALLOWED_SUFFIXES = tuple('.' + extension for extension in ALLOWED_EXTENSIONS)
+
+# Responses cached by (content digest, options), bounded by entry count and
+# total size so repeated uploads skip formatting
+_RESPONSE_CACHE_SIZE = 256
+_RESPONSE_CACHE_BYTES = 64 * 1024 * 1024
+_response_cache = OrderedDict()
+_response_cache_bytes = 0
+_response_cache_lock = threading.Lock()
+
+# Rendered index page and its ETag per application root
+_index_pages = {}
+
+# Idle formatters per (align_set, expand_lists, strict_indent) option tuple
+_idle_formatters = {}
 
 
 def allowed_file(filename):
     """Check if file has allowed extension."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    # Try the common lowercase suffix before lowercasing the whole name
+    return filename.endswith(_ALLOWED_SUFFIXES) or filename.lower().endswith(_ALLOWED_SUFFIXES)
 
 
 @app.route('/')
 def index():
-    """Serve the main web interface."""
-    return render_template('index.html')
+    """Serve the main web interface, rendered once per application root."""
+    page = _index_pages.get(request.script_root)
+    if page is None:
+        # Static asset URLs depend on where the app is mounted, so render
+        # on the first request for each root rather than at import
+        body = render_template('index.html').encode('utf-8')
+        page = (body, hashlib.blake2b(body, digest_size=16).hexdigest())
+        _index_pages[request.script_root] = page
+    
+    body, etag = page
+    response = app.response_class(body, mimetype='text/html')
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 
 @app.route('/format', methods=['POST'])
@@ -54,94 +86,248 @@ def format_tcl_file():
     if not allowed_file(file.filename):
         return jsonify({'error': 'Invalid file extension. Only .tcl files are allowed'}), 400
     
-    # Parse formatting options
-    align_set = request.form.get('align_set', 'false').lower() == 'true'
-    expand_lists = request.form.get('expand_lists', 'false').lower() == 'true'
-    strict_indent = request.form.get('strict_indent', 'false').lower() == 'true'
+    options = _parse_options()
+    
+    try:
+        file_content, is_error = _format_upload(file.read(), options)
+    except Exception as e:
+        return jsonify({'error': f'Processing error: {str(e)}'}), 500
+    
+    if is_error:
+        download_name = 'errors.log'
+    else:
+        # Generate output filename
+        download_name = f"{_base_name(file.filename)}_formatted.tcl"
+    
+    # The same output may be offered under another name, so the name is
+    # part of the tag
+    digest = hashlib.blake2b(file_content, digest_size=8)
+    digest.update(download_name.encode('utf-8'))
+    
+    response = _attachment(file_content, download_name, 'application/octet-stream')
+    response.set_etag(digest.hexdigest())
+    return response
+
+
+@app.route('/format_batch', methods=['POST'])
+def format_tcl_files():
+    """
+    Handle a multi-file upload and return all results in one zip archive.
     
-    # Create temporary files for processing
-    input_temp = None
-    output_file = None
-    error_file = None
+    Expects multipart/form-data with:
+    - files: one or more TCL files to format
+    - align_set: boolean (optional)
+    - expand_lists: boolean (optional)
+    - strict_indent: boolean (optional)
+    
+    Each file contributes NAME_formatted.tcl, or NAME_errors.log when it has
+    syntax errors. Returns the zip archive on success, JSON error on failure.
+    """
+    files = request.files.getlist('files')
+    
+    # Validate every upload before formatting any of them
+    if not files:
+        return jsonify({'error': 'No files provided'}), 400
+    
+    for file in files:
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+        
+        if not allowed_file(file.filename):
+            return jsonify({'error': 'Invalid file extension. Only .tcl files are allowed'}), 400
+    
+    options = _parse_options()
+    archive = BytesIO()
+    names = set()
     
     try:
-        # Save uploaded file to temporary location
-        input_temp = tempfile.NamedTemporaryFile(mode='w+b', suffix='.tcl', delete=False)
-        file.save(input_temp.name)
-        input_temp.close()
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            for file in files:
+                file_content, is_error = _format_upload(file.read(), options)
+                
+                base_name = _base_name(file.filename)
+                name = f"{base_name}_errors.log" if is_error else f"{base_name}_formatted.tcl"
+                
+                # Keep entries distinct when the same file name is uploaded twice
+                count = 1
+                unique_name = name
+                while unique_name in names:
+                    count += 1
+                    unique_name = f"{count}_{name}"
+                names.add(unique_name)
+                
+                zf.writestr(unique_name, file_content)
+    except Exception as e:
+        return jsonify({'error': f'Processing error: {str(e)}'}), 500
+    
+    return _attachment(archive.getvalue(), 'formatted.zip', 'application/zip')
+
+
+def _parse_options():
+    """
+    Parse the formatting options of the current request.
+    
+    Returns:
+        (align_set, expand_lists, strict_indent) tuple
+    """
+    form = request.form
+    return (
+        form.get('align_set', 'false').lower() == 'true',
+        form.get('expand_lists', 'false').lower() == 'true',
+        form.get('strict_indent', 'false').lower() == 'true'
+    )
+
+
+def _base_name(filename):
+    """Return the sanitized upload file name without its extension."""
+    return secure_filename(filename).rsplit('.', 1)[0]
+
+
+def _attachment(body, download_name, mimetype):
+    """
+    Build a download response for in-memory content.
+    
+    The bytes are sent as the response body in one piece, rather than
+    through send_file's file wrapper, which would stream a BytesIO copy in
+    8 KiB reads.
+    
+    Args:
+        body: Response bytes
+        download_name: File name offered to the browser
+        mimetype: Content type of the body
+    
+    Returns:
+        The response
+    """
+    response = app.response_class(body, mimetype=mimetype)
+    response.headers['Content-Disposition'] = _content_disposition(download_name)
+    response.cache_control.no_cache = True
+    return response
+
+
+@lru_cache(maxsize=256)
+def _content_disposition(download_name):
+    """
+    Build the Content-Disposition header value for a download name.
+    
+    Download names come from secure_filename and repeat across requests,
+    so each header value is formatted once.
+    
+    Args:
+        download_name: File name offered to the browser
+    
+    Returns:
+        The header value
+    """
+    return dump_options_header('attachment', {'filename': download_name})
+
+
+def _format_upload(content, options):
+    """
+    Format uploaded content, reusing the cached response for repeat uploads.
+    
+    Args:
+        content: Raw bytes of the uploaded file
+        options: (align_set, expand_lists, strict_indent) tuple
+    
+    Returns:
+        Tuple of (response bytes, is_error), where the bytes are the formatted
+        file or the error log
+    
+    Raises:
+        RuntimeError: If formatting produced neither
+    """
+    # The content digest and the options identify the response
+    key = (hashlib.blake2b(content, digest_size=16).digest(), options)
+    
+    cached = _cache_get(key)
+    if cached is None:
+        result = _format_content(content, options)
+        if result.content is None:
+            raise RuntimeError(result.message)
         
-        # Create formatter and process file
+        cached = (result.content, not result.success)
+        _cache_put(key, cached)
+    
+    return cached
+
+
+def _format_content(content, options):
+    """
+    Format uploaded TCL content in memory with a reused formatter.
+    
+    Formatters keep validation state while they run, so each one serves a
+    single request at a time: an idle formatter for the options is taken
+    from the pool, or a new one built, and returned to the pool afterwards.
+    
+    Args:
+        content: Raw bytes of the uploaded file
+        options: (align_set, expand_lists, strict_indent) tuple
+    
+    Returns:
+        FormattingResult whose content holds the formatted file or error log
+    """
+    idle = _idle_formatters.setdefault(options, [])
+    
+    try:
+        formatter = idle.pop()
+    except IndexError:
+        align_set, expand_lists, strict_indent = options
+        # Repeated uploads are served from the response cache, so pooled
+        # formatters keep no result cache of their own
         formatter = TCLFormatter(
             align_set=align_set,
             expand_lists=expand_lists,
-            strict_indent=strict_indent
+            strict_indent=strict_indent,
+            result_cache_bytes=0
         )
-        
-        result = formatter.format_file(input_temp.name)
-        
-        # Handle formatting result
-        if result.success:
-            # Return formatted file
-            output_file = result.output_path
-            if not output_file or not os.path.exists(output_file):
-                return jsonify({'error': 'Formatted file not found'}), 500
-            
-            # Generate output filename
-            original_name = secure_filename(file.filename)
-            base_name = original_name.rsplit('.', 1)[0]
-            output_filename = f"{base_name}_formatted.tcl"
-            
-            # Read file content before cleanup
-            with open(output_file, 'rb') as f:
-                file_content = f.read()
-            
-            # Clean up before sending response
-            try:
-                os.unlink(output_file)
-            except Exception:
-                pass
-            
-            # Send file from memory
-            return send_file(
-                BytesIO(file_content),
-                as_attachment=True,
-                download_name=output_filename,
-                mimetype='application/octet-stream'
-            )
-        else:
-            # Return error log
-            error_file = result.error_path
-            if not error_file or not os.path.exists(error_file):
-                return jsonify({'error': 'Error log not found'}), 500
-            
-            # Read file content before cleanup
-            with open(error_file, 'rb') as f:
-                file_content = f.read()
-            
-            # Clean up before sending response
-            try:
-                os.unlink(error_file)
-            except Exception:
-                pass
-            
-            # Send file from memory
-            return send_file(
-                BytesIO(file_content),
-                as_attachment=True,
-                download_name='errors.log',
-                mimetype='application/octet-stream'
-            )
-    
-    except Exception as e:
-        return jsonify({'error': f'Processing error: {str(e)}'}), 500
     
+    try:
+        return formatter.format_bytes(content)
     finally:
-        # Clean up temporary files
-        try:
-            if input_temp and os.path.exists(input_temp.name):
-                os.unlink(input_temp.name)
-        except Exception:
-            pass
+        idle.append(formatter)
+
+
+def _cache_get(key):
+    """
+    Look up a cached response and mark it as recently used.
+    
+    Args:
+        key: (content digest, options) tuple
+    
+    Returns:
+        Cached (response bytes, is_error) tuple, or None on a miss
+    """
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            _response_cache.move_to_end(key)
+        return cached
+
+
+def _cache_put(key, value):
+    """
+    Store a response, evicting the least recently used ones over the limits.
+    
+    Args:
+        key: (content digest, options) tuple
+        value: (response bytes, is_error) tuple
+    """
+    global _response_cache_bytes
+    
+    size = len(value[0])
+    if size > _RESPONSE_CACHE_BYTES:
+        return
+    
+    with _response_cache_lock:
+        if key in _response_cache:
+            return
+        _response_cache[key] = value
+        _response_cache_bytes += size
+        while (len(_response_cache) > _RESPONSE_CACHE_SIZE
+               or _response_cache_bytes > _RESPONSE_CACHE_BYTES):
+            _, (evicted, _) = _response_cache.popitem(last=False)
+            _response_cache_bytes -= len(evicted)
 
 
 @app.errorhandler(400)